@@ -1,36 +1,66 @@
 """API client for communicating with the Specsmith Agent API."""
 
-import json
-from typing import Any, AsyncGenerator, Dict
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Optional
 
 import httpx
+import orjson
 from rich.console import Console
 
 from .config import Config
 
+# Keep connections alive between the health, auth, session and message calls
+# so each request after the first reuses the same TCP/TLS connection.
+CONNECTION_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0
+)
+
+# Only the streaming read gets the long budget; a dead host fails fast.
+DEFAULT_TIMEOUT = httpx.Timeout(connect=5.0, read=300.0, write=30.0, pool=5.0)
+
+# Health and auth probes should answer within seconds.
+PROBE_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+
+class SessionNotFoundError(ValueError):
+    """Raised when the API no longer knows the requested session."""
+
 
 class SpecSmithAPIClient:
     """Client for communicating with the Specsmith Agent API."""
 
     def __init__(self, config: Config):
         self.config = config
-        self.client = httpx.AsyncClient(timeout=300.0)  # 5 minute timeout
+        self.client = httpx.AsyncClient(
+            base_url=config.api_url,
+            headers={
+                "Authorization": config.auth_header,
+                "Content-Type": "application/json",
+            },
+            timeout=DEFAULT_TIMEOUT,
+            limits=CONNECTION_LIMITS,
+            http2=True,
+        )
         self.console = Console()
+        self._closed = False
 
     async def __aenter__(self):
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.client.aclose()
+        await self.aclose()
 
     async def aclose(self):
-        """Close the client."""
+        """Close the client. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
         await self.client.aclose()
 
     async def health_check(self) -> bool:
         """Check if the API is healthy."""
         try:
-            response = await self.client.get(f"{self.config.api_url}/agent/health")
+            response = await self.client.get("/agent/health", timeout=PROBE_TIMEOUT)
             return response.status_code == 200
         except Exception as e:
             if self.config.debug:
@@ -40,14 +70,7 @@ class SpecSmithAPIClient:
     async def create_session(self) -> str:
         """Create a new session and return the session ID."""
         try:
-            response = await self.client.post(
-                f"{self.config.api_url}/agent/session",
-                headers={
-                    "Authorization": self.config.auth_header,
-                    "Content-Type": "application/json",
-                },
-                json={},
-            )
+            response = await self.client.post("/agent/session", json={})
             response.raise_for_status()
             data = response.json()
             session_id = data["session_id"]
@@ -73,30 +96,28 @@ class SpecSmithAPIClient:
         try:
             async with self.client.stream(
                 "POST",
-                f"{self.config.api_url}/agent/session/{session_id}/message",
-                headers={
-                    "Authorization": self.config.auth_header,
-                    "Content-Type": "application/json",
-                },
+                f"/agent/session/{session_id}/message",
                 json={"content": content},
             ) as response:
                 response.raise_for_status()
 
-                async for chunk in response.aiter_text():
-                    if chunk.strip():
-                        # Split by newlines in case multiple JSON objects are in one chunk
-                        for line in chunk.split("\n"):
-                            line = line.strip()
-                            if line:
-                                try:
-                                    action = json.loads(line)
-                                    yield action
-                                except json.JSONDecodeError:
-                                    if self.config.debug:
-                                        self.console.print(
-                                            f"[yellow]Failed to parse JSON: {line}[/yellow]"
-                                        )
-                                    continue
+                # Split NDJSON on raw bytes so orjson can parse each line
+                # without an intermediate str decode
+                buffer = bytearray()
+                async for chunk in response.aiter_bytes():
+                    buffer.extend(chunk)
+                    start = 0
+                    while (end := buffer.find(b"\n", start)) != -1:
+                        action = self._parse_line(buffer[start:end])
+                        start = end + 1
+                        if action is not None:
+                            yield action
+                    del buffer[:start]
+
+                # A final line may arrive without a trailing newline
+                action = self._parse_line(buffer)
+                if action is not None:
+                    yield action
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 401:
@@ -104,7 +125,7 @@ class SpecSmithAPIClient:
                     "Invalid API credentials. Please check your access key ID and token."
                 )
             elif e.response.status_code == 404:
-                raise ValueError(f"Session not found: {session_id}")
+                raise SessionNotFoundError(f"Session not found: {session_id}")
             else:
                 raise ValueError(
                     f"API error: {e.response.status_code} - {e.response.text}"
@@ -112,35 +133,41 @@ class SpecSmithAPIClient:
         except Exception as e:
             raise ValueError(f"Failed to send message: {e}")
 
+    def _parse_line(self, line: bytearray) -> Optional[Dict[str, Any]]:
+        """Decode one NDJSON line, returning None for blank or invalid lines."""
+        if not line.strip():
+            return None
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            if self.config.debug:
+                text = line.decode("utf-8", errors="replace")
+                self.console.print(f"[yellow]Failed to parse JSON: {text}[/yellow]")
+            return None
+
     async def test_connection(self) -> bool:
         """Test the connection to the API."""
+        # Health and authentication are independent probes; run them together
+        healthy, authenticated = await asyncio.gather(
+            self.health_check(), self._check_auth()
+        )
+        return healthy and authenticated
+
+    async def _check_auth(self) -> bool:
+        """Check that the configured credentials are accepted."""
         try:
-            # First check health
-            if not await self.health_check():
-                return False
-
-            # Then test authentication
-            try:
-                response = await self.client.get(
-                    f"{self.config.api_url}/agent/auth",
-                    headers={
-                        "Authorization": self.config.auth_header,
-                    },
-                )
-                response.raise_for_status()
-                return True
-            except httpx.HTTPStatusError as e:
+            response = await self.client.get("/agent/auth", timeout=PROBE_TIMEOUT)
+            response.raise_for_status()
+            return True
+        except httpx.HTTPStatusError as e:
+            if self.config.debug:
                 if e.response.status_code == 401:
-                    if self.config.debug:
-                        self.console.print("[red]Authentication failed[/red]")
-                    return False
+                    self.console.print("[red]Authentication failed[/red]")
                 else:
-                    if self.config.debug:
-                        self.console.print(
-                            f"[red]Auth check failed: {e.response.status_code}[/red]"
-                        )
-                    return False
-
+                    self.console.print(
+                        f"[red]Auth check failed: {e.response.status_code}[/red]"
+                    )
+            return False
         except Exception as e:
             if self.config.debug:
                 self.console.print(f"[red]Connection test failed: {e}[/red]")
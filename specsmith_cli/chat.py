@@ -1,28 +1,136 @@
 """Chat interface for the Specsmith Agent."""
 
+import asyncio
+import functools
 import os
-from typing import Any, Dict, Optional
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Tuple
 
-from prompt_toolkit import PromptSession
-from prompt_toolkit.formatted_text import HTML
-from prompt_toolkit.key_binding import KeyBindings
-from prompt_toolkit.styles import Style
 from rich.console import Console
-from rich.live import Live
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.spinner import Spinner
-from rich.text import Text
 
-from .api_client import SpecSmithAPIClient
+from .api_client import SessionNotFoundError, SpecSmithAPIClient
 from .config import Config
-from .utils import handle_file_action
+from .utils import find_existing_files, handle_file_action
+
+# prompt_toolkit and the heavier Rich renderables are imported where they are
+# used so that `specsmith --help`, `version` and `config` start quickly.
+if TYPE_CHECKING:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.formatted_text import HTML
+    from prompt_toolkit.styles import Style
+    from rich.console import RenderableType
+    from rich.markdown import Markdown
+
+# Minimum seconds between Live re-renders while a response is streaming
+RENDER_INTERVAL = 0.1
+
+# Move the cursor up one line and erase it
+_CLEAR_LINE = "\x1b[1A\r\x1b[K"
+
+# Inputs that end the interactive session (compared case-insensitively)
+_QUIT_COMMANDS = frozenset(("quit", "exit", "q"))
+
+# Marks action types that have no entry in ChatInterface._ACTION_HANDLERS
+_UNKNOWN = object()
+
+# List bullets and blockquotes may keep up to 6 spaces of indentation
+_INDENTABLE_MARKERS = frozenset("-*+>")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_prompt_session(supports_shift_enter: bool) -> "PromptSession":
+    """Create a prompt session with line continuation support using backslash.
+
+    Cached so every ChatInterface in the process shares one session.
+    """
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.key_binding import KeyBindings
+
+    kb = KeyBindings()
+
+    @kb.add("c-c")
+    def _(event):
+        """Exit on Ctrl+C."""
+        event.app.exit(exception=KeyboardInterrupt)
+
+    # Check if we're in a terminal that supports Shift+Enter (like VSCode/Cursor)
+    # For terminals that don't support Shift+Enter, add Ctrl+K as continuation trigger
+    if not supports_shift_enter:
+
+        @kb.add("c-k")
+        def _(event):
+            """Add backslash continuation for multiline input in terminals without Shift+Enter support."""
+            event.current_buffer.insert_text("\\")
+            event.current_buffer.validate_and_handle()
+
+    return PromptSession(
+        key_bindings=kb,
+        multiline=False,  # We'll handle multiline manually with backslash continuation
+        wrap_lines=True,
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_prompt_style() -> "Style":
+    """Style for the interface."""
+    from prompt_toolkit.styles import Style
+
+    return Style.from_dict(
+        {
+            "border": "#888888",
+            "title": "#00aaff bold",
+            "subtitle": "#888888",
+            "prompt": "#00aaff bold",
+            "input-box": "#ffffff bg:#1e1e1e",
+            "help-text": "#888888",
+            "workspace": "#ffaa00",
+        }
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _get_input_prompts() -> Tuple["HTML", "HTML"]:
+    """Prompts for the first and continuation lines of user input."""
+    from prompt_toolkit.formatted_text import HTML
+
+    # Continuation lines use an invisible prompt - just spaces for positioning
+    return HTML("<ansibrightblack>> </ansibrightblack>"), HTML("  ")
+
+
+def _warm_rich() -> None:
+    """Import and exercise the Rich renderables used for responses.
+
+    Run in a worker thread during startup so the first streamed token does
+    not pay for loading the Markdown parser and Pygments.
+    """
+    from rich.live import Live  # noqa: F401
+    from rich.markdown import Markdown
+    from rich.panel import Panel  # noqa: F401
+    from rich.spinner import Spinner
+
+    Markdown("# x\n\n`x` *x*\n\n```\nx\n```")
+    Spinner("dots")
 
 
 class ChatInterface:
     """Interactive chat interface for Specsmith CLI."""
 
-    def __init__(self, config: Config):
+    # Handler method names by action type; looked up by name so that
+    # subclasses and tests can override individual handlers. Message content
+    # is rendered by _send_message while streaming, so it has no handler.
+    _ACTION_HANDLERS: Dict[str, Optional[str]] = {
+        "message": None,
+        "file": "_handle_file_action",
+        "tool_use": "_handle_tool_use",
+        "limit_message": "_handle_limit_message",
+    }
+
+    def __init__(self, config: Config, interactive: bool = True):
+        """Create the chat interface.
+
+        Pass ``interactive=False`` when only ``send_single_message`` will be
+        used; prompt_toolkit is then never loaded.
+        """
         self.config = config
         self.console = Console()
         self.session_id: Optional[str] = None
@@ -34,46 +142,12 @@ class ChatInterface:
             "vscode",
             "cursor",
         )
-        # Create prompt session with custom key bindings
-        self.prompt_session = self._create_prompt_session()
-
-        # Style for the interface
-        self.style = Style.from_dict(
-            {
-                "border": "#888888",
-                "title": "#00aaff bold",
-                "subtitle": "#888888",
-                "prompt": "#00aaff bold",
-                "input-box": "#ffffff bg:#1e1e1e",
-                "help-text": "#888888",
-                "workspace": "#ffaa00",
-            }
-        )
-
-    def _create_prompt_session(self) -> PromptSession:
-        """Create a prompt session with line continuation support using backslash."""
-        kb = KeyBindings()
-
-        @kb.add("c-c")
-        def _(event):
-            """Exit on Ctrl+C."""
-            event.app.exit(exception=KeyboardInterrupt)
-
-        # Check if we're in a terminal that supports Shift+Enter (like VSCode/Cursor)
-        # For terminals that don't support Shift+Enter, add Ctrl+K as continuation trigger
-        if not self.supports_shift_enter:
-
-            @kb.add("c-k")
-            def _(event):
-                """Add backslash continuation for multiline input in terminals without Shift+Enter support."""
-                event.current_buffer.insert_text("\\")
-                event.current_buffer.validate_and_handle()
-
-        return PromptSession(
-            key_bindings=kb,
-            multiline=False,  # We'll handle multiline manually with backslash continuation
-            wrap_lines=True,
-        )
+        # Prompt session with custom key bindings, and the style for the interface
+        self.prompt_session: Optional["PromptSession"] = None
+        self.style: Optional["Style"] = None
+        if interactive:
+            self.prompt_session = _get_prompt_session(self.supports_shift_enter)
+            self.style = _get_prompt_style()
 
     def _normalize_markdown_alignment(self, content: str) -> str:
         """Normalize excessive left-padding outside fenced code blocks for better rendering.
@@ -81,23 +155,39 @@ class ChatInterface:
         Keeps fenced code blocks verbatim; preserves proper markdown indentation;
         only removes excessive leading spaces that would cause unintended code blocks.
         """
-        lines = content.splitlines()
-        normalized: list[str] = []
-        in_code = False
+        return "\n".join(
+            self._normalize_lines(content.splitlines(), {"in_code": False})
+        )
 
+    def _normalize_lines(
+        self, lines: Iterable[str], state: Dict[str, Any]
+    ) -> Iterator[str]:
+        """Yield normalized lines, tracking fenced code blocks in ``state``.
+
+        ``state["in_code"]`` is carried across calls so a streamed response
+        can be normalized one completed line at a time.
+        """
         for line in lines:
             rline = line.rstrip()
+
+            # Most lines are not indented and pass through unchanged
+            if not rline[:1].isspace():
+                if rline.startswith("```"):
+                    state["in_code"] = not state["in_code"]
+                yield rline
+                continue
+
             lstripped = rline.lstrip()
 
             # Handle fenced code blocks
             if lstripped.startswith("```"):
-                in_code = not in_code
-                normalized.append(rline)
+                state["in_code"] = not state["in_code"]
+                yield rline
                 continue
 
             # Preserve content inside fenced code blocks
-            if in_code:
-                normalized.append(rline)
+            if state["in_code"]:
+                yield rline
                 continue
 
             # For non-code content, be more careful about preserving markdown structure
@@ -105,66 +195,75 @@ class ChatInterface:
 
             # Preserve proper markdown indentation (2-3 spaces for nested lists, blockquotes)
             if leading_spaces <= 3:
-                normalized.append(rline)
-            # Only strip when we have excessive indentation (4+ spaces) that would trigger code blocks
-            elif leading_spaces >= 4:
-                # Check if this might be intentional indentation for nested elements
-                if lstripped.startswith(("-", "*", "+")) and leading_spaces <= 6:
-                    # Preserve reasonable list indentation (up to 6 spaces)
-                    normalized.append(rline)
-                elif lstripped.startswith(">") and leading_spaces <= 6:
-                    # Preserve reasonable blockquote indentation
-                    normalized.append(rline)
-                else:
-                    # Strip excessive indentation that would cause code blocks
-                    normalized.append(lstripped)
+                yield rline
+            # Preserve reasonable list/blockquote indentation (up to 6 spaces)
+            elif leading_spaces <= 6 and lstripped[:1] in _INDENTABLE_MARKERS:
+                yield rline
             else:
-                normalized.append(rline)
-
-        return "\n".join(normalized)
+                # Strip excessive indentation that would cause code blocks
+                yield lstripped
 
     def _show_welcome_message(self) -> None:
         """Show the welcome message if not already shown."""
         if not self.welcome_shown:
+            from rich.console import Group
+            from rich.panel import Panel
+
             welcome_panel = Panel(
                 "[#D4A63D]* Welcome to Specsmith Agent![/]\n\n  [bold]How can I help you today?[/bold]\n\n  [italic]I can help you create, refine, and manage software specifications.[/italic]",
                 title=None,
                 border_style="#6AA9FF",
                 padding=(1, 2),
             )
-            self.console.print(welcome_panel)
-            self.console.print()  # Add spacing after welcome
+            newline_key = "Shift+Enter" if self.supports_shift_enter else "Ctrl+K"
 
-            # Show input instructions once
-            if self.supports_shift_enter:
-                self.console.print(" • Press [bold]Shift+Enter[/bold] for a new line")
-            else:
-                self.console.print(" • Press [bold]Ctrl+K[/bold] for a new line")
-            self.console.print(" • Press [bold]Enter[/bold] to submit your message")
+            # Panel, spacing and input instructions go out in a single write
             self.console.print(
-                " • Type [italic]quit[/italic] or press [bold]Ctrl+C[/bold] / [bold]Ctrl+D[/bold] to exit"
+                Group(
+                    welcome_panel,
+                    "",
+                    f" • Press [bold]{newline_key}[/bold] for a new line",
+                    " • Press [bold]Enter[/bold] to submit your message",
+                    " • Type [italic]quit[/italic] or press [bold]Ctrl+C[/bold] / [bold]Ctrl+D[/bold] to exit",
+                    "",
+                )
             )
-            self.console.print()
 
             self.welcome_shown = True
 
     def _show_welcome_screen(self) -> None:
         """Display the welcome screen."""
-        # Clear screen
-        os.system("clear" if os.name == "posix" else "cls")
+        # Clear screen with escape codes; a no-op when not attached to a terminal
+        self.console.clear()
 
         # Show welcome message
         self._show_welcome_message()
 
     async def start(self) -> None:
         """Start the chat interface."""
+        self.api_client = None
+        warmup_task: Optional["asyncio.Task[None]"] = None
         try:
             # Initialize API client
             self.api_client = SpecSmithAPIClient(self.config)
 
+            # Load the response renderers and create the session while the
+            # connection test is in flight
+            warmup_task = asyncio.create_task(asyncio.to_thread(_warm_rich))
+            session_task = asyncio.create_task(self.api_client.create_session())
+
             # Test connection
             self.console.print("[dim]Connecting to Specsmith API...[/dim]")
-            if not await self.api_client.test_connection():
+            connected = False
+            try:
+                connected = await self.api_client.test_connection()
+            finally:
+                if not connected:
+                    # Drop the speculative session, retrieving its outcome so a
+                    # failed request is not reported as an unhandled task error
+                    session_task.cancel()
+                    await asyncio.gather(session_task, return_exceptions=True)
+            if not connected:
                 self.console.print("[red]❌ Failed to connect to Specsmith API[/red]")
                 self.console.print(
                     "Please check that your API credentials are correct."
@@ -174,8 +273,10 @@ class ChatInterface:
 
             self.console.print("[green]✅ Connected to Specsmith API[/green]")
 
-            # Create session for chat
-            self.session_id = await self.api_client.create_session()
+            # Session for chat was requested alongside the connection test
+            self.session_id = await session_task
+            # The warm-up is only an optimization; a failure must not end the chat
+            await asyncio.gather(warmup_task, return_exceptions=True)
 
             # Show welcome screen after connection is established
             self._show_welcome_screen()
@@ -186,6 +287,11 @@ class ChatInterface:
         except Exception as e:
             self.console.print(f"[red]❌ Error: {e}[/red]")
         finally:
+            if warmup_task is not None:
+                # Early exits skip awaiting the warm-up; retrieve its outcome
+                # so a failure is not reported as an unhandled task error
+                warmup_task.cancel()
+                await asyncio.gather(warmup_task, return_exceptions=True)
             if self.api_client:
                 await self.api_client.aclose()
 
@@ -199,11 +305,12 @@ class ChatInterface:
                 # Get user input with line continuation support
                 message = await self._get_multiline_input()
 
-                if message.lower().strip() in ("quit", "exit", "q"):
+                stripped = message.strip()
+                if len(stripped) <= 4 and stripped.lower() in _QUIT_COMMANDS:
                     self.console.print("[dim]Goodbye![/dim]")
                     break
 
-                if not message.strip():
+                if not stripped:
                     continue
 
                 # Show the user's message
@@ -224,6 +331,8 @@ class ChatInterface:
 
     async def _get_multiline_input(self) -> str:
         """Get user input with backslash line continuation support."""
+        first_prompt, continuation_prompt = _get_input_prompts()
+
         # Show a simple prompt before input
         self.console.print()
 
@@ -233,11 +342,10 @@ class ChatInterface:
 
         while True:
             if first_line:
-                prompt = HTML("<ansibrightblack>> </ansibrightblack>")
+                prompt = first_prompt
                 first_line = False
             else:
-                # Use invisible prompt - just spaces for positioning
-                prompt = HTML("  ")
+                prompt = continuation_prompt
 
             try:
                 line = await self.prompt_session.prompt_async(prompt, style=self.style)
@@ -257,7 +365,7 @@ class ChatInterface:
                 # Clear the line that shows the backslash, replace with clean version
                 try:
                     stream = self.console.file
-                    stream.write("\x1b[1A\r\x1b[K")  # Clear the line with backslash
+                    stream.write(_CLEAR_LINE)  # Clear the line with backslash
                     stream.flush()
                 except Exception:
                     pass
@@ -272,11 +380,10 @@ class ChatInterface:
                 lines.append(line)
                 break
 
-        # Clear all the input lines we've shown
+        # Clear all the input lines we've shown in a single write
         try:
             stream = self.console.file
-            for _ in range(lines_entered):
-                stream.write("\x1b[1A\r\x1b[K")
+            stream.write(_CLEAR_LINE * lines_entered)
             stream.flush()
         except Exception:
             pass
@@ -285,71 +392,176 @@ class ChatInterface:
 
     def _show_user_message(self, message: str) -> None:
         """Display the user's message in a panel, prefixed with '> ' on first line."""
+        from rich.console import Group
+        from rich.panel import Panel
+        from rich.text import Text
+
         # Prefix first line with "> " and indent subsequent lines for readability
-        lines = message.splitlines() or [""]
-        prefixed_lines = [("> " + lines[0]) if lines else "> "]
-        for ln in lines[1:]:
-            prefixed_lines.append("  " + ln)
+        first, *rest = message.splitlines() or [""]
+        body = "> " + first + "".join("\n  " + ln for ln in rest)
 
         user_panel = Panel(
-            Text("\n".join(prefixed_lines), style="dim"),
+            Text(body, style="dim"),
             title=None,
             border_style="bright_black",
             padding=(0, 1),
             title_align="left",
         )
-        self.console.print(user_panel)
-        # And exactly one blank line after the user panel before assistant output
-        self.console.print()
+        # And exactly one blank line after the user panel before assistant
+        # output, emitted together with the panel in a single write
+        self.console.print(Group(user_panel, Text()))
 
     async def _send_message(self, message: str) -> None:
         """Send a message and stream the response using Rich Live panel."""
         if not self.api_client or not self.session_id:
             raise ValueError("API client or session not initialized")
 
+        from rich.console import Group
+        from rich.live import Live
+        from rich.markdown import Markdown
+        from rich.spinner import Spinner
+        from rich.text import Text
+
         try:
-            response_text = ""
+            # Completed lines are normalized once; only the unfinished tail
+            # is re-examined on each chunk.
+            norm_state = {"in_code": False}
+            normalized_lines: list[str] = []
+            # Chunks of the unfinished last line, joined only when needed
+            tail_parts: list[str] = []
+            last_render = 0.0
+            dirty = False
             first_content_received = False
             pending_file_actions = []
 
+            # Paragraphs before the last blank line outside a code block are
+            # final, so their Markdown is parsed once and reused while the
+            # current paragraph keeps streaming.
+            paragraph_end = 0
+            prefix: Optional["Markdown"] = None
+            prefix_end = 0
+
+            def current_tail() -> str:
+                if len(tail_parts) > 1:
+                    tail_parts[:] = ["".join(tail_parts)]
+                return tail_parts[0] if tail_parts else ""
+
+            def render() -> "RenderableType":
+                nonlocal prefix, prefix_end
+                if paragraph_end > prefix_end:
+                    prefix = Markdown("\n".join(normalized_lines[:paragraph_end]))
+                    prefix_end = paragraph_end
+
+                lines = normalized_lines[prefix_end:]
+                tail = current_tail()
+                if tail:
+                    # Normalize the partial line without committing fence state
+                    lines.extend(self._normalize_lines([tail], dict(norm_state)))
+                current = Markdown("\n".join(lines))
+                if prefix is None:
+                    return current
+                return Group(prefix, Text(), current)
+
+            # Pending render for text that arrived inside the throttle window
+            flush_handle: Optional[asyncio.TimerHandle] = None
+
+            def flush() -> None:
+                nonlocal dirty, last_render, flush_handle
+                if flush_handle is not None:
+                    flush_handle.cancel()
+                    flush_handle = None
+                if dirty:
+                    live.update(render(), refresh=True)
+                    last_render = time.monotonic()
+                    dirty = False
+
             # Ensure a blank line precedes assistant output for consistent spacing
             self.console.print()
 
-            # Start with spinner while waiting for first response
+            # Start with spinner while waiting for first response. The spinner
+            # animates on Live's refresh thread and is cleared once content
+            # arrives; the response itself is only redrawn when it changes.
             spinner = Spinner("dots", text="[dim]Thinking...[/dim]")
-
-            with Live(spinner, refresh_per_second=10, console=self.console) as live:
+            live = Live(
+                spinner, refresh_per_second=10, console=self.console, transient=True
+            )
+            live.start()
+            try:
                 async for action in self.api_client.send_message(
                     self.session_id, message
                 ):
-                    if action.get("type") == "message":
-                        content = action.get("content", "")
+                    action_type = action.get("type")
+                    if action_type == "message":
+                        content = action.get("content")
                         if content:
                             # Switch from spinner to markdown on first content
                             if not first_content_received:
                                 first_content_received = True
-                                live.update(Markdown(""))
-
-                            response_text += content
-                            # Apply markdown normalization before rendering
-                            normalized_text = self._normalize_markdown_alignment(
-                                response_text
-                            )
-                            live.update(Markdown(normalized_text))
-                    elif action.get("type") == "file":
+                                live.stop()
+                                live = Live(console=self.console, auto_refresh=False)
+                                live.start()
+
+                            tail_parts.append(content)
+                            if "\n" in content:
+                                *completed, tail = current_tail().split("\n")
+                                tail_parts[:] = [tail]
+                                for line in self._normalize_lines(
+                                    completed, norm_state
+                                ):
+                                    normalized_lines.append(line)
+                                    if not line and not norm_state["in_code"]:
+                                        paragraph_end = len(normalized_lines)
+                            dirty = True
+
+                            now = time.monotonic()
+                            if now - last_render >= RENDER_INTERVAL:
+                                flush()
+                            elif flush_handle is None:
+                                # Render once the window closes, even if the
+                                # stream stalls before the next chunk
+                                flush_handle = asyncio.get_running_loop().call_later(
+                                    last_render + RENDER_INTERVAL - now, flush
+                                )
+                    elif action_type == "file":
                         # Defer file actions to avoid prompt conflicts with Live display
                         pending_file_actions.append(action)
                     else:
+                        # Bring the live region up to date first so output
+                        # stays in the order it was streamed
+                        flush()
                         # Handle other actions immediately (tool_use, limit_message, etc.)
                         await self._handle_action(action)
 
+                # Render the complete response as one document so Markdown
+                # that spans paragraphs (loose lists, link references) is exact
+                if dirty or prefix is not None:
+                    lines = normalized_lines
+                    tail = current_tail()
+                    if tail:
+                        lines = lines + list(self._normalize_lines([tail], norm_state))
+                    live.update(Markdown("\n".join(lines)), refresh=True)
+            finally:
+                if flush_handle is not None:
+                    flush_handle.cancel()
+                live.stop()
+
             # Handle file actions after Live context ends to allow prompts to display
+            existing = find_existing_files(
+                action["filename"]
+                for action in pending_file_actions
+                if action.get("filename")
+            )
             for action in pending_file_actions:
-                await self._handle_file_action(action)
+                filename = action.get("filename")
+                if await self._handle_file_action(action, exists=filename in existing):
+                    existing.add(filename)
 
             # One trailing blank line after assistant output to separate from next turn
             self.console.print()
 
+        except SessionNotFoundError:
+            # Let callers that can recover with a new session do so
+            raise
         except Exception as e:
             self.console.print(f"[red]❌ Error: {e}[/red]")
 
@@ -362,47 +574,52 @@ class ChatInterface:
                 f"[cyan]DEBUG: Received action type: {action_type}[/cyan]"
             )
 
-        if action_type == "message":
-            # Content is handled in _send_message for streaming
-            pass
-        elif action_type == "file":
-            await self._handle_file_action(action)
-        else:
-            await self._handle_non_file_action(action)
-
-    async def _handle_non_file_action(self, action: Dict[str, Any]) -> None:
-        """Handle non-file actions that can be processed during Live streaming."""
-        action_type = action.get("type")
-
-        if self.config.debug:
-            self.console.print(
-                f"[cyan]DEBUG: Handling non-file action: {action_type}[/cyan]"
-            )
-
-        if action_type == "tool_use":
-            description = action.get("description") or action.get("tool_name", "tool")
-            self.console.print(f"[dim]( {description} )…[/dim]")
-        elif action_type == "limit_message":
-            content = action.get("content", "")
-            if content:
-                self.console.print(f"[dim]{content}[/dim]")
-        else:
+        handler = self._ACTION_HANDLERS.get(action_type, _UNKNOWN)
+        if handler is _UNKNOWN:
             # Unknown action type, just print it
             if self.config.debug:
                 self.console.print(f"[yellow]Unknown action type: {action}[/yellow]")
-
-    async def _handle_file_action(self, action: Dict[str, Any]) -> None:
+        elif handler is not None:
+            await getattr(self, handler)(action)
+
+    async def _handle_tool_use(self, action: Dict[str, Any]) -> None:
+        """Show a one-line note for a tool the agent is running."""
+        description = action.get("description") or action.get("tool_name", "tool")
+        self.console.print(f"[dim]( {description} )…[/dim]")
+
+    async def _handle_limit_message(self, action: Dict[str, Any]) -> None:
+        """Show a usage-limit notice from the API."""
+        content = action.get("content")
+        if content:
+            self.console.print(f"[dim]{content}[/dim]")
+
+    async def _handle_file_action(
+        self, action: Dict[str, Any], exists: Optional[bool] = None
+    ) -> bool:
         """Delegate file actions to utility handler."""
-        await handle_file_action(self.console, action, debug=self.config.debug)
+        return await handle_file_action(
+            self.console, action, debug=self.config.debug, exists=exists
+        )
 
     async def send_single_message(self, message: str) -> None:
         """Send a single message and exit."""
+        self.api_client = None
         try:
             # Initialize API client
             self.api_client = SpecSmithAPIClient(self.config)
 
+            # Reuse the previous invocation's session while it is still valid
+            self.session_id = self.config.load_cached_session()
+            if self.session_id:
+                try:
+                    await self._send_message(message)
+                    return
+                except SessionNotFoundError:
+                    self.config.clear_cached_session()
+
             # Create session
             self.session_id = await self.api_client.create_session()
+            self.config.save_cached_session(self.session_id)
 
             # Send message and handle response
             await self._send_message(message)
@@ -1,21 +1,30 @@
 """Configuration management for the Specsmith CLI."""
 
-import base64
+import binascii
+import functools
+import json
 import os
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from rich.console import Console
-from rich.prompt import Prompt
 
-from .constants import DEFAULT_API_URL
+from .constants import DEFAULT_API_URL, SESSION_CACHE_TTL
+from .files import write_file
 
 console = Console()
 
+# SPECSMITH_DEBUG values that enable debug output (compared lowercased)
+_TRUTHY = frozenset(("1", "true", "yes"))
+
 
 class Config:
     """Configuration for the Specsmith CLI."""
 
+    __slots__ = ("api_url", "access_key_id", "access_key_token", "debug", "auth_header")
+
     def __init__(
         self,
         api_url: str,
@@ -28,12 +37,12 @@ class Config:
         self.access_key_token = access_key_token
         self.debug = debug
 
-    @property
-    def auth_header(self) -> str:
-        """Get the authorization header for API requests."""
-        credentials = f"{self.access_key_id}:{self.access_key_token}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        return f"Basic {encoded_credentials}"
+        # Authorization header for API requests, encoded once up front
+        credentials = f"{access_key_id}:{access_key_token}"
+        encoded_credentials = binascii.b2a_base64(
+            credentials.encode(), newline=False
+        ).decode("ascii")
+        self.auth_header = f"Basic {encoded_credentials}"
 
     @classmethod
     def get_config_dir(cls) -> Path:
@@ -45,39 +54,25 @@ class Config:
         """Get the credentials file path."""
         return cls.get_config_dir() / "credentials"
 
+    @classmethod
+    def get_session_cache_file(cls) -> Path:
+        """Get the cached chat session file path."""
+        return cls.get_config_dir() / "session"
+
     @classmethod
     def load_from_file(cls) -> Optional["Config"]:
         """Load configuration from file."""
         credentials_file = cls.get_credentials_file()
 
-        if not credentials_file.exists():
-            return None
-
         try:
-            with open(credentials_file, "r") as f:
-                content = f.read()
-
-            # Parse key=value format
-            config_dict = {}
-            for line in content.splitlines():
-                line = line.strip()
-                if line and "=" in line:
-                    key, value = line.split("=", 1)
-                    config_dict[key.strip()] = value.strip()
-
-            # Extract values with defaults
-            api_url = config_dict.get("api_url", DEFAULT_API_URL)
-            access_key_id = config_dict.get("access_key_id")
-            access_key_token = config_dict.get("access_key_token")
-            debug = config_dict.get("debug", "false").lower() == "true"
-
-            if not access_key_id or not access_key_token:
-                return None
-
-            return cls(api_url, access_key_id, access_key_token, debug)
+            mtime_ns = credentials_file.stat().st_mtime_ns
+        except OSError:
+            return None
 
-        except Exception:
+        values = _read_credentials_file(str(credentials_file), mtime_ns)
+        if values is None:
             return None
+        return cls(*values)
 
     def save_to_file(self) -> None:
         """Save configuration to file."""
@@ -85,11 +80,97 @@ class Config:
         config_dir.mkdir(parents=True, exist_ok=True)
 
         credentials_file = self.get_credentials_file()
-        with open(credentials_file, "w") as f:
-            f.write(f"api_url={self.api_url}\n")
-            f.write(f"access_key_id={self.access_key_id}\n")
-            f.write(f"access_key_token={self.access_key_token}\n")
-            f.write(f"debug={str(self.debug).lower()}\n")
+        _read_credentials_file.cache_clear()
+        payload = (
+            f"api_url={self.api_url}\n"
+            f"access_key_id={self.access_key_id}\n"
+            f"access_key_token={self.access_key_token}\n"
+            f"debug={str(self.debug).lower()}\n"
+        )
+        # Create the file owner-only from the start rather than chmod-ing later
+        fd = os.open(credentials_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        if hasattr(os, "fchmod"):
+            # The mode above only applies to new files; tighten older ones too
+            os.fchmod(fd, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(payload)
+
+    def load_cached_session(self) -> Optional[str]:
+        """Return the cached session ID for these credentials, if still fresh."""
+        try:
+            with open(self.get_session_cache_file(), "r") as f:
+                cached = json.load(f)
+
+            if (
+                cached.get("api_url") != self.api_url
+                or cached.get("access_key_id") != self.access_key_id
+                or cached.get("expires_at", 0) <= time.time()
+            ):
+                return None
+            return cached.get("session_id")
+        except Exception:
+            # Unreadable or malformed cache; the next save replaces it
+            return None
+
+    def save_cached_session(self, session_id: str) -> None:
+        """Cache a session ID so later invocations can skip creating one."""
+        cached = {
+            "session_id": session_id,
+            "api_url": self.api_url,
+            "access_key_id": self.access_key_id,
+            "expires_at": time.time() + SESSION_CACHE_TTL,
+        }
+        try:
+            # Session IDs grant access like the credentials beside them
+            write_file(
+                self.get_session_cache_file(), json.dumps(cached).encode(), mode=0o600
+            )
+        except OSError:
+            # The cache is only an optimization
+            pass
+
+    @classmethod
+    def clear_cached_session(cls) -> None:
+        """Forget the cached session ID."""
+        try:
+            cls.get_session_cache_file().unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=4)
+def _read_credentials_file(
+    path: str, mtime_ns: int
+) -> Optional[Tuple[str, str, str, bool]]:
+    """Parse a credentials file into Config arguments.
+
+    Cached on the file's path and modification time so repeated loads in
+    one process skip re-reading an unchanged file.
+    """
+    try:
+        with open(path, "r") as f:
+            content = f.read()
+
+        # Parse key=value format
+        config_dict = {}
+        for line in content.splitlines():
+            key, sep, value = line.partition("=")
+            if sep:
+                config_dict[key.strip()] = value.strip()
+
+        # Extract values with defaults
+        api_url = config_dict.get("api_url", DEFAULT_API_URL)
+        access_key_id = config_dict.get("access_key_id")
+        access_key_token = config_dict.get("access_key_token")
+        debug = config_dict.get("debug", "false").lower() == "true"
+
+        if not access_key_id or not access_key_token:
+            return None
+
+        return api_url, access_key_id, access_key_token, debug
+
+    except Exception:
+        return None
 
 
 def load_config(
@@ -106,11 +187,7 @@ def load_config(
     final_api_url = api_url or os.getenv("SPECSMITH_API_URL")
     final_access_key_id = access_key_id or os.getenv("SPECSMITH_ACCESS_KEY_ID")
     final_access_key_token = access_key_token or os.getenv("SPECSMITH_ACCESS_KEY_TOKEN")
-    final_debug = debug or os.getenv("SPECSMITH_DEBUG", "").lower() in (
-        "1",
-        "true",
-        "yes",
-    )
+    final_debug = debug or os.getenv("SPECSMITH_DEBUG", "").lower() in _TRUTHY
 
     # Fall back to file values where not provided
     if not final_api_url and file_config:
@@ -142,8 +219,21 @@ def setup_credentials_interactive() -> None:
     console.print("You can get your API keys from the Specsmith web interface.")
     console.print()
 
-    access_key_id = Prompt.ask("Access Key ID")
-    access_key_token = Prompt.ask("Access Key Token", password=True)
+    if sys.stdin.isatty():
+        # Imported here so commands other than setup do not load Rich's prompts
+        from rich.prompt import Prompt
+
+        access_key_id = Prompt.ask("Access Key ID")
+        access_key_token = Prompt.ask("Access Key Token", password=True)
+    else:
+        # Piped input (CI, Docker): the ID and token are the first two lines
+        lines = [line.strip() for line in sys.stdin.read().splitlines()]
+        access_key_id, access_key_token = (lines + ["", ""])[:2]
+
+    if not access_key_id or not access_key_token:
+        # Never replace working credentials with blank ones
+        console.print("[red]❌ Access Key ID and Access Key Token are required[/red]")
+        sys.exit(1)
 
     config = Config(DEFAULT_API_URL, access_key_id, access_key_token)
     config.save_to_file()
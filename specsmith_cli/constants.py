@@ -2,3 +2,6 @@
 
 # Default API URL for Specsmith
 DEFAULT_API_URL = "https://api.specsmith.ai"
+
+# Seconds a cached chat session is reused by later `send_single_message` calls
+SESSION_CACHE_TTL = 30 * 60
@@ -0,0 +1,65 @@
+"""Atomic file writes for Specsmith.
+
+Kept apart from ``utils`` so that ``config`` can save files without
+importing asyncio and Rich's prompts.
+"""
+
+import contextlib
+import os
+import secrets
+import shutil
+from pathlib import Path
+from typing import Optional, Tuple
+
+# Flags for a new temporary file; O_BINARY keeps Windows from translating
+# newlines
+_TEMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def _open_temp_file(target: Path, mode: int) -> Tuple[int, str]:
+    """Create a uniquely named, empty file beside ``target``.
+
+    Returns the open descriptor and the file's path. ``mode`` is reduced by
+    the umask, as it would be for open().
+    """
+    while True:
+        tmp_name = str(target.with_name(f".{target.name}.{secrets.token_hex(4)}"))
+        try:
+            return os.open(tmp_name, _TEMP_FLAGS, mode), tmp_name
+        except FileExistsError:
+            continue
+
+
+def write_file(file_path: Path, data: bytes, mode: Optional[int] = None) -> None:
+    """Write ``data`` to ``file_path`` atomically.
+
+    The bytes go to a uniquely named temporary file beside the target in a
+    single write, which then replaces the target so a failed save never
+    leaves a truncated file. Symlinks are followed so the file they point to
+    is updated and the link itself is kept.
+
+    An overwritten file keeps its permissions unless ``mode`` is given, in
+    which case the file always gets ``mode`` (less the umask).
+    """
+    target = Path(os.path.realpath(file_path))
+    create_mode = 0o666 if mode is None else mode
+    try:
+        fd, tmp_name = _open_temp_file(target, create_mode)
+    except FileNotFoundError:
+        # Only create missing parents; the usual directory already exists
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = _open_temp_file(target, create_mode)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        if mode is None:
+            try:
+                # Keep the permissions of a file being overwritten
+                shutil.copymode(target, tmp_name)
+            except FileNotFoundError:
+                pass
+        os.replace(tmp_name, target)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
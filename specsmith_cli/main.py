@@ -1,6 +1,5 @@
 """Main CLI entry point for Specsmith."""
 
-import asyncio
 import sys
 from typing import Optional
 
@@ -8,8 +7,6 @@ import click
 from rich.console import Console
 
 from . import __version__
-from .api_client import SpecSmithAPIClient
-from .chat import run_chat
 from .config import (
     Config,
     load_config,
@@ -17,9 +14,23 @@ from .config import (
     validate_credentials,
 )
 
+# The API client and chat modules (httpx, prompt_toolkit) are imported by the
+# commands that use them so `--version`, `config` and `setup` start quickly.
+
 console = Console()
 
 
+def _run(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    try:
+        import uvloop
+    except ImportError:
+        import asyncio
+
+        return asyncio.run(coro)
+    return uvloop.run(coro)
+
+
 def _start_chat(ctx: click.Context) -> None:
     if ctx.obj["config"] is None:
         console.print(
@@ -30,8 +41,11 @@ def _start_chat(ctx: click.Context) -> None:
     if not validate_credentials(ctx.obj["config"]):
         console.print("[red]❌ Invalid API credentials format[/red]")
         sys.exit(1)
+
+    from .chat import run_chat
+
     try:
-        asyncio.run(run_chat(ctx.obj["config"]))
+        _run(run_chat(ctx.obj["config"]))
     except KeyboardInterrupt:
         console.print("\n[yellow]Goodbye![/yellow]")
     except Exception as e:
@@ -115,8 +129,7 @@ def chat(ctx: click.Context) -> None:
 @click.pass_context
 def setup(ctx: click.Context) -> None:
     """Set up API credentials interactively."""
-    console.print("[bold blue]Specsmith CLI Setup[/bold blue]")
-    console.print()
+    console.print("[bold blue]Specsmith CLI Setup[/bold blue]\n")
     setup_credentials_interactive()
 
 
@@ -127,20 +140,26 @@ def test(ctx: click.Context) -> None:
     config: Config = ctx.obj.get("config")
     console.print("[blue]Testing connection to Specsmith API...[/blue]")
 
+    from .api_client import SpecSmithAPIClient
+
     async def test_connection():
         async with SpecSmithAPIClient(config) as client:
             if await client.test_connection():
-                console.print("[green]✅ Connection successful![/green]")
-                console.print(f"API URL: {config.api_url}")
-                console.print("Your credentials are working correctly.")
+                console.print(
+                    "[green]✅ Connection successful![/green]\n"
+                    f"API URL: {config.api_url}\n"
+                    "Your credentials are working correctly."
+                )
             else:
-                console.print("[red]❌ Connection failed[/red]")
-                console.print("Please check that your API credentials are correct.")
-                console.print("You can update them by running: specsmith setup")
+                console.print(
+                    "[red]❌ Connection failed[/red]\n"
+                    "Please check that your API credentials are correct.\n"
+                    "You can update them by running: specsmith setup"
+                )
                 sys.exit(1)
 
     try:
-        asyncio.run(test_connection())
+        _run(test_connection())
     except Exception as e:
         console.print(f"[red]❌ Test failed: {e}[/red]")
         sys.exit(1)
@@ -158,10 +177,12 @@ def config(ctx: click.Context) -> None:
         )
         sys.exit(1)
 
-    console.print("[bold blue]Current Configuration[/bold blue]")
-    console.print(f"API URL: {config.api_url}")
-    console.print(f"Access Key ID: {config.access_key_id[:8]}...")
-    console.print(f"Debug Mode: {config.debug}")
+    console.print(
+        "[bold blue]Current Configuration[/bold blue]\n"
+        f"API URL: {config.api_url}\n"
+        f"Access Key ID: {config.access_key_id[:8]}...\n"
+        f"Debug Mode: {config.debug}"
+    )
 
 
 @main.command()
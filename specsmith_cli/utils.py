@@ -1,21 +1,40 @@
 """CLI utilities for Specsmith."""
 
+import asyncio
+import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional, Set
 
 from rich.console import Console
 from rich.prompt import Confirm
 
+from .files import write_file
+
+
+def find_existing_files(filenames: Iterable[str]) -> Set[str]:
+    """Return the subset of ``filenames`` that already exist on disk.
+
+    Each distinct name is checked once with ``os.path.lexists``, which also
+    counts dangling links and follows the filesystem's own case rules.
+    """
+    return {name for name in set(filenames) if os.path.lexists(name)}
+
 
 async def handle_file_action(
-    console: Console, action: Dict[str, Any], debug: bool = False
-) -> None:
+    console: Console,
+    action: Dict[str, Any],
+    debug: bool = False,
+    exists: Optional[bool] = None,
+) -> bool:
     """Handle file actions with user prompts and saving logic.
 
     Parameters:
     - console: Rich Console to print to
     - action: dict containing 'filename' and 'content'
     - debug: whether to emit debug lines
+    - exists: whether the file is already known to exist; checked when None
+
+    Returns True if the file was saved.
     """
     filename = action.get("filename", "")
     content = action.get("content", "")
@@ -28,42 +47,34 @@ async def handle_file_action(
     if not filename or not content:
         if debug:
             console.print("[cyan]DEBUG: Missing filename or content, skipping[/cyan]")
-        return
+        return False
 
-    file_path = Path(filename)
+    if exists is None:
+        # lexists matches find_existing_files, which also lists dangling links
+        exists = os.path.lexists(filename)
 
-    # Check if file exists
-    if file_path.exists():
+    # Overwrites default to "no"; new files default to "yes"
+    if exists:
         if debug:
             console.print("[cyan]DEBUG: File exists, asking for overwrite[/cyan]")
-        overwrite = Confirm.ask(
-            f"\n[cyan][italic]Before we continue, would you like to overwrite[/italic] '{filename}'[italic]?[/italic][/]",
-            default=False,
-        )
-        if not overwrite:
-            console.print(f"[yellow]Skipped saving {filename}[/yellow]")
-            return
+        question = f"\n[cyan][italic]Before we continue, would you like to overwrite[/italic] '{filename}'[italic]?[/italic][/]"
     else:
         if debug:
             console.print("[cyan]DEBUG: File doesn't exist, asking to save[/cyan]")
         # File doesn't exist, ask for save with content summary
-        content_lines = len(content.splitlines()) if content else 0
-        content_size = (
-            f"{len(content)} chars, {content_lines} lines" if content else "empty"
-        )
-        save = Confirm.ask(
-            f"\n[cyan][italic]Before we continue, would you like to save file[/italic] '{filename}' [italic]({content_size})?[/italic][/]",
-            default=True,
-        )
-        if not save:
-            console.print(f"[yellow]Skipped saving {filename}[/yellow]")
-            return
+        content_size = f"{len(content)} chars, {len(content.splitlines())} lines"
+        question = f"\n[cyan][italic]Before we continue, would you like to save file[/italic] '{filename}' [italic]({content_size})?[/italic][/]"
+
+    if not Confirm.ask(question, default=not exists):
+        console.print(f"[yellow]Skipped saving {filename}[/yellow]")
+        return False
 
     # Save the file
     try:
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, "w") as f:
-            f.write(content)
+        # Keep disk I/O off the event loop
+        await asyncio.to_thread(write_file, Path(filename), content.encode("utf-8"))
         console.print(f"[green]✅ Saved {filename}[/green]")
     except Exception as e:
         console.print(f"[red]❌ Failed to save {filename}: {e}[/red]")
+        return False
+    return True
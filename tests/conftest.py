@@ -0,0 +1,9 @@
+"""Shared pytest configuration."""
+
+from pytest_socket import disable_socket
+
+
+def pytest_runtest_setup():
+    """Fail fast if a test tries to reach the network instead of a mock."""
+    # asyncio's event loop wakes itself through a Unix socketpair
+    disable_socket(allow_unix_socket=True)
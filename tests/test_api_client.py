@@ -1,16 +1,23 @@
 """Tests for the API client module."""
 
 from contextlib import asynccontextmanager
-from unittest.mock import AsyncMock, Mock, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, create_autospec, patch
 
 import httpx
 import pytest
 
-from specsmith_cli.api_client import SpecSmithAPIClient, check_api_health
+from specsmith_cli.api_client import (
+    DEFAULT_TIMEOUT,
+    PROBE_TIMEOUT,
+    SessionNotFoundError,
+    SpecSmithAPIClient,
+    check_api_health,
+)
 from specsmith_cli.config import Config
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config():
     """Create a test configuration."""
     return Config(
@@ -21,7 +28,7 @@ def config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def debug_config():
     """Create a test configuration with debug enabled."""
     return Config(
@@ -32,414 +39,361 @@ def debug_config():
     )
 
 
-class TestSpecSmithAPIClient:
-    """Test cases for SpecSmithAPIClient."""
-
-    @pytest.mark.asyncio
-    async def test_health_check_success(self, config):
-        """Test successful health check."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            # Mock successful response
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_client.get.return_value = mock_response
-
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
-
-            result = await client.health_check()
-
-            assert result is True
-            mock_client.get.assert_called_once_with(
-                "http://localhost:8000/agent/health"
-            )
-
-    @pytest.mark.asyncio
-    async def test_health_check_failure(self, config):
-        """Test failed health check."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            # Mock failed response
-            mock_response = Mock()
-            mock_response.status_code = 500
-            mock_client.get.return_value = mock_response
-
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
-
-            result = await client.health_check()
-
-            assert result is False
-
-    @pytest.mark.asyncio
-    async def test_health_check_exception(self, config):
-        """Test health check with exception."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+# Autospeccing walks httpx.AsyncClient once; each test resets the same mock
+_ASYNC_CLIENT_SPEC = create_autospec(httpx.AsyncClient, instance=True)
 
-            # Mock exception
-            mock_client.get.side_effect = httpx.ConnectError("Connection failed")
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
-
-            result = await client.health_check()
-
-            assert result is False
-
-    @pytest.mark.asyncio
-    async def test_create_session_success(self, config):
-        """Test successful session creation."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            # Mock successful response
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.json.return_value = {"session_id": "test-session-123"}
-            mock_client.post.return_value = mock_response
-
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
-
-            session_id = await client.create_session()
-
-            assert session_id == "test-session-123"
-            mock_client.post.assert_called_once_with(
-                "http://localhost:8000/agent/session",
-                headers={
-                    "Authorization": config.auth_header,
-                    "Content-Type": "application/json",
-                },
-                json={},
-            )
+@pytest.fixture
+def mock_httpx():
+    """Patch httpx.AsyncClient so new API clients wrap an autospecced mock."""
+    _ASYNC_CLIENT_SPEC.reset_mock(return_value=True, side_effect=True)
+    # Tests replace stream with a plain function, which reset_mock() cannot undo
+    stream = _ASYNC_CLIENT_SPEC.stream
+    try:
+        with patch(
+            "httpx.AsyncClient", return_value=_ASYNC_CLIENT_SPEC
+        ) as mock_client_class:
+            yield mock_client_class, _ASYNC_CLIENT_SPEC
+    finally:
+        _ASYNC_CLIENT_SPEC.stream = stream
 
-    @pytest.mark.asyncio
-    async def test_create_session_auth_error(self, config):
-        """Test session creation with authentication error."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
 
-            # Mock 401 response
-            mock_response = Mock()
-            mock_response.status_code = 401
-            mock_response.text = "Unauthorized"
-            error = httpx.HTTPStatusError("401", request=Mock(), response=mock_response)
-            mock_client.post.side_effect = error
+@pytest.fixture
+def mock_client(mock_httpx):
+    """The autospecced mock standing in for the underlying httpx client."""
+    return mock_httpx[1]
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
 
-            with pytest.raises(ValueError, match="Invalid API credentials"):
-                await client.create_session()
+@pytest.fixture
+def api_client(config, mock_client):
+    """Create an API client backed by ``mock_client``."""
+    return SpecSmithAPIClient(config)
 
-    @pytest.mark.asyncio
-    async def test_create_session_not_found_error(self, config):
-        """Test session creation with 404 error."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
 
-            # Mock 404 response
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_response.text = "Not Found"
-            error = httpx.HTTPStatusError("404", request=Mock(), response=mock_response)
-            mock_client.post.side_effect = error
+@pytest.fixture
+async def routed_client(config):
+    """Build API clients backed by a real AsyncClient over a route table.
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
+    ``routes`` maps a URL path to the ``httpx.Response`` it answers with;
+    other paths get a 404. Each request is recorded on the returned list.
+    The AsyncClient keeps the headers, timeouts and limits the API client
+    configures; only its transport is replaced.
+    """
+    clients = []
+    async_client = httpx.AsyncClient
 
-            with pytest.raises(ValueError, match="API endpoint not found"):
-                await client.create_session()
+    async def make(routes):
+        requests = []
 
-    @pytest.mark.asyncio
-    async def test_create_session_generic_error(self, config):
-        """Test session creation with generic HTTP error."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        def handler(request):
+            requests.append(request)
+            return routes.get(request.url.path) or httpx.Response(404)
 
-            # Mock 500 response
-            mock_response = Mock()
-            mock_response.status_code = 500
-            mock_response.text = "Internal Server Error"
-            error = httpx.HTTPStatusError("500", request=Mock(), response=mock_response)
-            mock_client.post.side_effect = error
+        def with_transport(*args, **kwargs):
+            return async_client(*args, transport=httpx.MockTransport(handler), **kwargs)
 
+        with patch("httpx.AsyncClient", side_effect=with_transport):
             client = SpecSmithAPIClient(config)
-            client.client = mock_client
-
-            with pytest.raises(ValueError, match="API error: 500"):
-                await client.create_session()
+        clients.append(client)
+        return client, requests
 
-    @pytest.mark.asyncio
-    async def test_send_message_success(self, config):
-        """Test successful message sending with streaming response."""
-        # Create mock chunks with JSON data
-        json_chunks = [
-            '{"type": "message", "content": "Hello"}\n',
-            '{"type": "message", "content": "World"}\n',
-            '{"type": "file_action", "filename": "test.py"}\n',
-        ]
+    yield make
+    for client in clients:
+        await client.aclose()
 
-        async def mock_aiter_text():
-            for chunk in json_chunks:
-                yield chunk
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+@pytest.fixture
+def mock_sync_client():
+    """Patch httpx.Client and return the mock used inside its ``with`` block."""
+    with patch("httpx.Client") as mock_client_class:
+        mock_client = Mock()
+        mock_client_class.return_value.__enter__.return_value = mock_client
+        yield mock_client
 
-            # Create mock response
-            mock_response = AsyncMock()
-            mock_response.status_code = 200
-            mock_response.aiter_text = mock_aiter_text
-            mock_response.raise_for_status = Mock()
 
-            # Create async context manager using asynccontextmanager
-            @asynccontextmanager
-            async def mock_stream(*args, **kwargs):
-                yield mock_response
+def _response(status_code, text=""):
+    """Create a plain response stub for calls that are never asserted on."""
+    return SimpleNamespace(status_code=status_code, text=text)
 
-            mock_client.stream = mock_stream
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
+def _stream_of(chunks, calls=None):
+    """Build a fake ``client.stream`` whose response body is ``chunks``.
 
-            # Collect all yielded actions
-            actions = []
-            async for action in client.send_message("test-session", "Hello"):
-                actions.append(action)
+    When ``calls`` is given, each stream call's arguments are appended to it.
+    """
 
-            assert len(actions) == 3
-            assert actions[0] == {"type": "message", "content": "Hello"}
-            assert actions[1] == {"type": "message", "content": "World"}
-            assert actions[2] == {"type": "file_action", "filename": "test.py"}
+    async def aiter_bytes():
+        for chunk in chunks:
+            yield chunk
 
-    @pytest.mark.asyncio
-    async def test_send_message_invalid_json(self, debug_config):
-        """Test message sending with invalid JSON in response."""
-
-        async def mock_aiter_text():
-            yield '{"type": "message", "content": "Valid"}\n'
-            yield "invalid json\n"
-            yield '{"type": "message", "content": "Also valid"}\n'
+    response = SimpleNamespace(
+        status_code=200, aiter_bytes=aiter_bytes, raise_for_status=lambda: None
+    )
 
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+    @asynccontextmanager
+    async def stream(*args, **kwargs):
+        if calls is not None:
+            calls.append((args, kwargs))
+        yield response
 
-            # Create mock response
-            mock_response = AsyncMock()
-            mock_response.status_code = 200
-            mock_response.aiter_text = mock_aiter_text
-            mock_response.raise_for_status = Mock()
+    return stream
 
-            # Create async context manager using asynccontextmanager
-            @asynccontextmanager
-            async def mock_stream(*args, **kwargs):
-                yield mock_response
 
-            mock_client.stream = mock_stream
+# NDJSON body of a typical streamed reply and the actions it decodes to
+_MESSAGE_CHUNKS = (
+    b'{"type": "message", "content": "Hello"}\n',
+    b'{"type": "message", "content": "World"}\n',
+    b'{"type": "file_action", "filename": "test.py"}\n',
+)
+_MESSAGE_ACTIONS = (
+    {"type": "message", "content": "Hello"},
+    {"type": "message", "content": "World"},
+    {"type": "file_action", "filename": "test.py"},
+)
 
-            client = SpecSmithAPIClient(debug_config)
-            client.client = mock_client
 
-            # Collect all yielded actions (should skip invalid JSON)
-            actions = []
-            async for action in client.send_message("test-session", "Hello"):
-                actions.append(action)
+class TestSpecSmithAPIClient:
+    """Test cases for SpecSmithAPIClient."""
 
-            assert len(actions) == 2
-            assert actions[0] == {"type": "message", "content": "Valid"}
-            assert actions[1] == {"type": "message", "content": "Also valid"}
+    @pytest.mark.parametrize("status_code,expected", [(200, True), (500, False)])
+    async def test_health_check_status(self, routed_client, status_code, expected):
+        """Test that only a 200 health response counts as healthy."""
+        client, requests = await routed_client(
+            {"/agent/health": httpx.Response(status_code)}
+        )
 
-    @pytest.mark.asyncio
-    async def test_send_message_session_not_found(self, config):
-        """Test message sending with session not found error."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        result = await client.health_check()
 
-            # Mock 404 response
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_response.text = "Session not found"
-            error = httpx.HTTPStatusError("404", request=Mock(), response=mock_response)
+        assert result is expected
+        assert [r.url.path for r in requests] == ["/agent/health"]
+        assert requests[0].extensions["timeout"] == PROBE_TIMEOUT.as_dict()
 
-            # Create async context manager that raises error
-            @asynccontextmanager
-            async def mock_stream(*args, **kwargs):
-                raise error
-                yield  # This won't be reached
+    async def test_health_check_exception(self, api_client, mock_client):
+        """Test health check with exception."""
+        # Mock exception
+        mock_client.get.side_effect = httpx.ConnectError("Connection failed")
 
-            mock_client.stream = mock_stream
+        result = await api_client.health_check()
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
+        assert result is False
 
-            with pytest.raises(ValueError, match="Session not found: test-session"):
-                async for _ in client.send_message("test-session", "Hello"):
-                    pass
+    async def test_create_session_success(self, config, routed_client):
+        """Test successful session creation."""
+        client, requests = await routed_client(
+            {
+                "/agent/session": httpx.Response(
+                    200, json={"session_id": "test-session-123"}
+                )
+            }
+        )
+
+        session_id = await client.create_session()
+
+        assert session_id == "test-session-123"
+        assert len(requests) == 1
+        assert requests[0].method == "POST"
+        assert requests[0].content == b"{}"
+        assert requests[0].headers["Authorization"] == config.auth_header
+        assert requests[0].headers["Content-Type"] == "application/json"
+        assert requests[0].extensions["timeout"] == DEFAULT_TIMEOUT.as_dict()
+
+    @pytest.mark.parametrize(
+        "status_code,text,match",
+        [
+            (401, "Unauthorized", "Invalid API credentials"),
+            (404, "Not Found", "API endpoint not found"),
+            (500, "Internal Server Error", "API error: 500"),
+        ],
+    )
+    async def test_create_session_http_errors(
+        self, routed_client, status_code, text, match
+    ):
+        """Test that HTTP errors from session creation become ValueErrors."""
+        client, _ = await routed_client(
+            {"/agent/session": httpx.Response(status_code, text=text)}
+        )
+
+        with pytest.raises(ValueError, match=match):
+            await client.create_session()
+
+    async def test_send_message_success(self, api_client, mock_client):
+        """Test successful message sending with streaming response."""
+        mock_client.stream = _stream_of(_MESSAGE_CHUNKS)
 
-    @pytest.mark.asyncio
-    async def test_test_connection_success(self, config):
-        """Test successful connection test."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        # Collect all yielded actions
+        actions = []
+        async for action in api_client.send_message("test-session", "Hello"):
+            actions.append(action)
 
-            # Mock successful health check
-            health_response = Mock()
-            health_response.status_code = 200
+        assert tuple(actions) == _MESSAGE_ACTIONS
 
-            # Mock successful auth check
-            auth_response = Mock()
-            auth_response.status_code = 200
+    async def test_send_message_uses_client_default_headers(
+        self, api_client, mock_client
+    ):
+        """Test that streaming relies on the client's prebuilt headers."""
+        calls = []
+        mock_client.stream = _stream_of(_MESSAGE_CHUNKS[:1], calls)
 
-            mock_client.get.side_effect = [health_response, auth_response]
+        async for _ in api_client.send_message("test-session", "Hi"):
+            pass
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
+        assert calls == [
+            (
+                ("POST", "/agent/session/test-session/message"),
+                {"json": {"content": "Hi"}},
+            )
+        ]
 
-            result = await client.test_connection()
+    async def test_send_message_invalid_json(self, debug_config, mock_client):
+        """Test message sending with invalid JSON in response."""
+        mock_client.stream = _stream_of(
+            [
+                b'{"type": "message", "content": "Valid"}\n',
+                b"invalid json\n",
+                b"\r\n",
+                b'{"type": "message", "content": "Also valid"}',
+            ]
+        )
+        client = SpecSmithAPIClient(debug_config)
+
+        # Collect all yielded actions (should skip invalid JSON)
+        actions = []
+        async for action in client.send_message("test-session", "Hello"):
+            actions.append(action)
+
+        assert actions == [
+            {"type": "message", "content": "Valid"},
+            {"type": "message", "content": "Also valid"},
+        ]
 
-            assert result is True
-            assert mock_client.get.call_count == 2
-            mock_client.get.assert_any_call("http://localhost:8000/agent/health")
-            mock_client.get.assert_any_call(
-                "http://localhost:8000/agent/auth",
-                headers={"Authorization": config.auth_header},
-            )
+    async def test_send_message_json_split_across_chunks(self, routed_client):
+        """Test that a JSON line split across network chunks is still parsed."""
 
-    @pytest.mark.asyncio
-    async def test_test_connection_health_failure(self, config):
-        """Test connection test with health check failure."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        async def body():
+            yield b'{"type": "message", "con'
+            yield b'tent": "Hello"}\n{"type": "message", '
+            yield b'"content": "World"}\n'
 
-            # Mock failed health check
-            health_response = Mock()
-            health_response.status_code = 500
-            mock_client.get.return_value = health_response
+        client, _ = await routed_client(
+            {"/agent/session/test-session/message": httpx.Response(200, content=body())}
+        )
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
-
-            result = await client.test_connection()
-
-            assert result is False
-            # Should only call health check, not auth check
-            assert mock_client.get.call_count == 1
-
-    @pytest.mark.asyncio
-    async def test_test_connection_auth_failure(self, config):
-        """Test connection test with auth failure."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-
-            # Mock successful health check
-            health_response = Mock()
-            health_response.status_code = 200
-
-            # Mock failed auth check
-            auth_response = Mock()
-            auth_response.status_code = 401
-            auth_error = httpx.HTTPStatusError(
-                "401", request=Mock(), response=auth_response
-            )
+        actions = [a async for a in client.send_message("test-session", "Hello")]
 
-            mock_client.get.side_effect = [health_response, auth_error]
+        assert actions == [
+            {"type": "message", "content": "Hello"},
+            {"type": "message", "content": "World"},
+        ]
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
+    @pytest.mark.parametrize("chunk_size", [7, 4096])
+    async def test_send_message_large_stream(self, api_client, mock_client, chunk_size):
+        """Test that a long stream cut at arbitrary byte offsets parses fully."""
+        body = b"".join(
+            b'{"type": "message", "content": "line %d"}\n' % i for i in range(10_000)
+        )
+        mock_client.stream = _stream_of(
+            [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+        )
 
-            result = await client.test_connection()
+        actions = [a async for a in api_client.send_message("test-session", "Hi")]
 
-            assert result is False
+        assert len(actions) == 10_000
+        assert actions[-1] == {"type": "message", "content": "line 9999"}
 
-    @pytest.mark.asyncio
-    async def test_context_manager(self, config):
+    async def test_send_message_session_not_found(self, api_client, mock_client):
+        """Test message sending with session not found error."""
+        # Mock 404 response
+        mock_response = _response(404, text="Session not found")
+        error = httpx.HTTPStatusError("404", request=Mock(), response=mock_response)
+
+        # Create async context manager that raises error
+        @asynccontextmanager
+        async def mock_stream(*args, **kwargs):
+            raise error
+            yield  # This won't be reached
+
+        mock_client.stream = mock_stream
+
+        with pytest.raises(
+            SessionNotFoundError, match="Session not found: test-session"
+        ):
+            async for _ in api_client.send_message("test-session", "Hello"):
+                pass
+
+    @pytest.mark.parametrize(
+        "health_status,auth_status,expected",
+        [(200, 200, True), (500, 200, False), (200, 401, False)],
+    )
+    async def test_test_connection(
+        self, routed_client, health_status, auth_status, expected
+    ):
+        """Test that the connection test needs both probes to pass."""
+        client, requests = await routed_client(
+            {
+                "/agent/health": httpx.Response(health_status),
+                "/agent/auth": httpx.Response(auth_status),
+            }
+        )
+
+        result = await client.test_connection()
+
+        assert result is expected
+        # Health and auth probes both run, concurrently
+        assert sorted(r.url.path for r in requests) == ["/agent/auth", "/agent/health"]
+        assert all(r.extensions["timeout"] == PROBE_TIMEOUT.as_dict() for r in requests)
+
+    async def test_context_manager(self, config, mock_client):
         """Test using the client as an async context manager."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        async with SpecSmithAPIClient(config) as client:
+            assert isinstance(client, SpecSmithAPIClient)
+            assert client.client == mock_client
 
-            async with SpecSmithAPIClient(config) as client:
-                assert isinstance(client, SpecSmithAPIClient)
-                assert client.client == mock_client
+        # Should call aclose when exiting context
+        mock_client.aclose.assert_called_once()
 
-            # Should call aclose when exiting context
-            mock_client.aclose.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_aclose(self, config):
+    async def test_aclose(self, api_client, mock_client):
         """Test manual client closing."""
-        with patch("httpx.AsyncClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        await api_client.aclose()
 
-            client = SpecSmithAPIClient(config)
-            client.client = mock_client
+        mock_client.aclose.assert_called_once()
 
+    async def test_aclose_idempotent(self, config, mock_client):
+        """Test that closing twice only closes the underlying client once."""
+        async with SpecSmithAPIClient(config) as client:
             await client.aclose()
 
-            mock_client.aclose.assert_called_once()
+        mock_client.aclose.assert_called_once()
 
+    def test_client_defaults(self, config, mock_httpx):
+        """Test that the shared client carries base URL and auth headers."""
+        mock_client_class, _ = mock_httpx
+        SpecSmithAPIClient(config)
 
-class TestCheckAPIHealth:
-    """Test cases for the synchronous health check function."""
-
-    def test_check_api_health_success(self):
-        """Test successful health check."""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = Mock()
-            mock_client_class.return_value.__enter__.return_value = mock_client
+        kwargs = mock_client_class.call_args.kwargs
+        assert kwargs["base_url"] == "http://localhost:8000"
+        assert kwargs["headers"]["Authorization"] == config.auth_header
+        assert kwargs["http2"] is True
 
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_client.get.return_value = mock_response
 
-            result = check_api_health("http://localhost:8000")
-
-            assert result is True
-            mock_client.get.assert_called_once_with(
-                "http://localhost:8000/agent/health"
-            )
-
-    def test_check_api_health_failure(self):
-        """Test failed health check."""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = Mock()
-            mock_client_class.return_value.__enter__.return_value = mock_client
+class TestCheckAPIHealth:
+    """Test cases for the synchronous health check function."""
 
-            mock_response = Mock()
-            mock_response.status_code = 500
-            mock_client.get.return_value = mock_response
+    @pytest.mark.parametrize("status_code,expected", [(200, True), (500, False)])
+    def test_check_api_health_status(self, mock_sync_client, status_code, expected):
+        """Test that only a 200 health response counts as healthy."""
+        mock_sync_client.get.return_value = _response(status_code)
 
-            result = check_api_health("http://localhost:8000")
+        result = check_api_health("http://localhost:8000")
 
-            assert result is False
+        assert result is expected
+        mock_sync_client.get.assert_called_once_with(
+            "http://localhost:8000/agent/health"
+        )
 
-    def test_check_api_health_exception(self):
+    def test_check_api_health_exception(self, mock_sync_client):
         """Test health check with exception."""
-        with patch("httpx.Client") as mock_client_class:
-            mock_client = Mock()
-            mock_client_class.return_value.__enter__.return_value = mock_client
-
-            mock_client.get.side_effect = httpx.ConnectError("Connection failed")
+        mock_sync_client.get.side_effect = httpx.ConnectError("Connection failed")
 
-            result = check_api_health("http://localhost:8000")
+        result = check_api_health("http://localhost:8000")
 
-            assert result is False
+        assert result is False
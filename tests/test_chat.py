@@ -1,15 +1,28 @@
 """Tests for the chat module."""
 
-from unittest.mock import AsyncMock, patch
+import asyncio
+import io
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from rich.console import Console
 
+from specsmith_cli.api_client import SessionNotFoundError
 from specsmith_cli.chat import ChatInterface, run_chat
 from specsmith_cli.config import Config
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def config_dir(tmp_path, monkeypatch):
+    """Keep session caches out of the real home directory."""
+    monkeypatch.setattr(Config, "get_config_dir", classmethod(lambda cls: tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(scope="module")
 def config():
     """Create a test configuration."""
     return Config(
@@ -20,7 +33,7 @@ def config():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def debug_config():
     """Create a test configuration with debug enabled."""
     return Config(
@@ -31,6 +44,44 @@ def debug_config():
     )
 
 
+@pytest.fixture
+def mock_client_class(monkeypatch):
+    """Replace the API client class used by the chat module with a mock."""
+    mock_class = Mock(return_value=AsyncMock())
+    monkeypatch.setattr("specsmith_cli.chat.SpecSmithAPIClient", mock_class)
+    return mock_class
+
+
+@pytest.fixture
+def mock_client(mock_client_class):
+    """The AsyncMock API client instance handed out by ``mock_client_class``."""
+    return mock_client_class.return_value
+
+
+@pytest.fixture
+def chat(config):
+    """A ChatInterface that renders to an in-memory, non-terminal console."""
+    chat = ChatInterface(config)
+    chat.console = Console(file=io.StringIO(), force_terminal=False)
+    return chat
+
+
+@pytest.fixture
+def debug_chat(debug_config):
+    """Like ``chat``, but with debug output enabled."""
+    chat = ChatInterface(debug_config)
+    chat.console = Console(file=io.StringIO(), force_terminal=False)
+    return chat
+
+
+@pytest.fixture
+def confirm(monkeypatch, request):
+    """Answer every Confirm.ask prompt with the parametrized value (default yes)."""
+    answer = getattr(request, "param", True)
+    monkeypatch.setattr("rich.prompt.Confirm.ask", lambda *_args, **_kw: answer)
+    return answer
+
+
 class TestChatInterface:
     """Test cases for ChatInterface class."""
 
@@ -42,161 +93,198 @@ class TestChatInterface:
         assert isinstance(chat.console, Console)
         assert chat.session_id is None
         assert chat.api_client is None
-
-    @pytest.mark.asyncio
-    async def test_start_success(self, config):
+        assert chat.prompt_session is not None
+
+    def test_init_shares_prompt_session(self, config):
+        """Test that prompt sessions are built once per process."""
+        assert (
+            ChatInterface(config).prompt_session is ChatInterface(config).prompt_session
+        )
+
+    def test_init_non_interactive(self, config):
+        """Test that a non-interactive interface skips prompt setup."""
+        chat = ChatInterface(config, interactive=False)
+
+        assert chat.prompt_session is None
+        assert chat.style is None
+
+    def test_normalize_lines_incremental(self, chat):
+        """Test that feeding lines one at a time matches whole-text normalization."""
+        content = (
+            "Intro\n"
+            "        over-indented prose\n"
+            "    - nested item\n"
+            "```python\n"
+            "        keep = 'indent'\n"
+            "```\n"
+            "    > quote"
+        )
+
+        state = {"in_code": False}
+        streamed = []
+        for line in content.split("\n"):
+            streamed.extend(chat._normalize_lines([line], state))
+
+        assert "\n".join(streamed) == chat._normalize_markdown_alignment(content)
+        assert streamed[1] == "over-indented prose"
+        assert streamed[4] == "        keep = 'indent'"
+        assert state["in_code"] is False
+
+    def test_show_welcome_screen_clears_without_subprocess(self, chat):
+        """Test that the welcome screen clears via the console, not a shell."""
+        with patch("os.system") as mock_system, patch.object(
+            chat.console, "clear"
+        ) as mock_clear, patch.object(chat.console, "print"):
+            chat._show_welcome_screen()
+
+            mock_clear.assert_called_once()
+            mock_system.assert_not_called()
+            assert chat.welcome_shown is True
+
+    async def test_start_success(self, chat, config, mock_client_class, mock_client):
         """Test successful chat start."""
-        with patch("specsmith_cli.chat.SpecSmithAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        # Mock successful connection test and session creation
+        mock_client.test_connection.return_value = True
+        mock_client.create_session.return_value = "test-session-123"
 
-            # Mock successful connection test and session creation
-            mock_client.test_connection.return_value = True
-            mock_client.create_session.return_value = "test-session-123"
+        # Mock the interactive loop to avoid infinite loop
+        with patch.object(chat, "_interactive_loop") as mock_loop:
+            await chat.start()
 
-            chat = ChatInterface(config)
+        # Verify API client was initialized
+        mock_client_class.assert_called_once_with(config)
 
-            # Mock the interactive loop to avoid infinite loop
-            with patch.object(chat, "_interactive_loop") as mock_loop:
-                await chat.start()
+        # Verify connection was tested
+        mock_client.test_connection.assert_called_once()
 
-                # Verify API client was initialized
-                mock_client_class.assert_called_once_with(config)
+        # Verify session was created
+        mock_client.create_session.assert_called_once()
 
-                # Verify connection was tested
-                mock_client.test_connection.assert_called_once()
+        # Verify session ID was set
+        assert chat.session_id == "test-session-123"
 
-                # Verify session was created
-                mock_client.create_session.assert_called_once()
+        # Verify interactive loop was called
+        mock_loop.assert_called_once()
 
-                # Verify session ID was set
-                assert chat.session_id == "test-session-123"
+        # Verify the client was closed
+        mock_client.aclose.assert_called_once()
 
-                # Verify interactive loop was called
-                mock_loop.assert_called_once()
-
-                # Verify client was closed
-                mock_client.aclose.assert_called_once()
-
-    @pytest.mark.asyncio
-    async def test_start_connection_failure(self, config):
+    async def test_start_connection_failure(self, chat, mock_client):
         """Test chat start with connection failure."""
-        with patch("specsmith_cli.chat.SpecSmithAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        # Mock failed connection test
+        mock_client.test_connection.return_value = False
 
-            # Mock failed connection test
-            mock_client.test_connection.return_value = False
+        with patch.object(chat.console, "print") as mock_print:
+            await chat.start()
 
-            chat = ChatInterface(config)
+        # Verify connection was tested
+        mock_client.test_connection.assert_called_once()
 
-            with patch.object(chat.console, "print") as mock_print:
-                await chat.start()
+        # Verify the speculative session was not used
+        assert chat.session_id is None
 
-                # Verify connection was tested
-                mock_client.test_connection.assert_called_once()
+        # Verify error messages were printed
+        assert mock_print.call_count >= 4  # Multiple error messages
 
-                # Verify session was NOT created
-                mock_client.create_session.assert_not_called()
+        # Verify the client was closed
+        mock_client.aclose.assert_called_once()
 
-                # Verify error messages were printed
-                assert mock_print.call_count >= 4  # Multiple error messages
+    async def test_start_connection_failure_settles_background_tasks(
+        self, chat, mock_client
+    ):
+        """Test a failed start leaves no pending or unretrieved background task."""
+        mock_client.test_connection.return_value = False
+        before = asyncio.all_tasks()
+
+        # Keep the warm-up running until start() has returned
+        release = threading.Event()
+        with patch(
+            "specsmith_cli.chat._warm_rich", side_effect=lambda: release.wait(5)
+        ):
+            try:
+                await chat.start()
+                assert asyncio.all_tasks() == before
+            finally:
+                release.set()
 
-                # Verify client was closed
-                mock_client.aclose.assert_called_once()
+    async def test_start_survives_warmup_failure(self, chat, mock_client):
+        """Test a failing Rich warm-up does not stop the chat from starting."""
+        mock_client.test_connection.return_value = True
+        mock_client.create_session.return_value = "test-session-123"
 
-    @pytest.mark.asyncio
-    async def test_start_exception_handling(self, config):
-        """Test chat start with exception."""
-        with patch("specsmith_cli.chat.SpecSmithAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
+        with patch(
+            "specsmith_cli.chat._warm_rich", side_effect=RuntimeError("warm-up")
+        ), patch.object(chat, "_interactive_loop") as mock_loop:
+            await chat.start()
 
-            # Mock exception during connection test
-            mock_client.test_connection.side_effect = Exception("Connection error")
+        assert chat.session_id == "test-session-123"
+        mock_loop.assert_called_once()
 
-            chat = ChatInterface(config)
+    async def test_start_exception_handling(self, chat, mock_client):
+        """Test chat start with exception."""
+        # Mock exception during connection test
+        mock_client.test_connection.side_effect = Exception("Connection error")
 
-            with patch.object(chat.console, "print") as mock_print:
-                await chat.start()
+        with patch.object(chat.console, "print") as mock_print:
+            await chat.start()
 
-                # Verify error was printed
-                mock_print.assert_called_with("[red]❌ Error: Connection error[/red]")
+        # Verify error was printed
+        mock_print.assert_called_with("[red]❌ Error: Connection error[/red]")
 
-                # Verify client was closed
-                mock_client.aclose.assert_called_once()
+        # Verify the client was closed
+        mock_client.aclose.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_interactive_loop_quit_commands(self, config):
+    @pytest.mark.parametrize("quit_cmd", ["quit", "exit", "q", "QUIT", "EXIT"])
+    async def test_interactive_loop_quit_commands(self, chat, quit_cmd):
         """Test interactive loop with quit commands."""
-        chat = ChatInterface(config)
-
-        # Test different quit commands
-        quit_commands = ["quit", "exit", "q", "QUIT", "EXIT"]
-
-        for quit_cmd in quit_commands:
-            with patch.object(chat, "_get_multiline_input", return_value=quit_cmd):
-                with patch.object(chat.console, "print") as mock_print:
-                    await chat._interactive_loop()
+        with patch.object(
+            chat, "_get_multiline_input", return_value=quit_cmd
+        ), patch.object(chat.console, "print") as mock_print:
+            await chat._interactive_loop()
 
-                    # Should print goodbye message
-                    mock_print.assert_called_with("[dim]Goodbye![/dim]")
+            # Should print goodbye message
+            mock_print.assert_called_with("[dim]Goodbye![/dim]")
 
-    @pytest.mark.asyncio
-    async def test_interactive_loop_empty_message(self, config):
+    async def test_interactive_loop_empty_message(self, chat):
         """Test interactive loop with empty messages."""
-        chat = ChatInterface(config)
-
         # Mock prompt to return empty string, then quit
         with patch.object(
             chat, "_get_multiline_input", side_effect=["", "   ", "quit"]
+        ), patch.object(chat, "_send_message") as mock_send, patch.object(
+            chat.console, "print"
         ):
-            with patch.object(chat, "_send_message") as mock_send:
-                with patch.object(chat.console, "print"):
-                    await chat._interactive_loop()
+            await chat._interactive_loop()
 
-                    # Should not call send_message for empty inputs
-                    mock_send.assert_not_called()
+            # Should not call send_message for empty inputs
+            mock_send.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_interactive_loop_keyboard_interrupt(self, config):
+    async def test_interactive_loop_keyboard_interrupt(self, chat):
         """Test interactive loop with keyboard interrupt."""
-        chat = ChatInterface(config)
-
         with patch.object(
             chat, "_get_multiline_input", side_effect=KeyboardInterrupt()
-        ):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._interactive_loop()
+        ), patch.object(chat.console, "print") as mock_print:
+            await chat._interactive_loop()
 
-                # Should print goodbye message
-                mock_print.assert_called_with("\n[dim]Goodbye![/dim]")
+            # Should print goodbye message
+            mock_print.assert_called_with("\n[dim]Goodbye![/dim]")
 
-    @pytest.mark.asyncio
-    async def test_interactive_loop_exception_handling(self, config):
+    async def test_interactive_loop_exception_handling(self, chat):
         """Test interactive loop with exception handling."""
-        chat = ChatInterface(config)
-
         # Mock prompt to raise exception, then quit
         with patch.object(
             chat, "_get_multiline_input", side_effect=[Exception("Input error"), "quit"]
-        ):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._interactive_loop()
-
-                # Should print error message
-                error_calls = [
-                    call
-                    for call in mock_print.call_args_list
-                    if "[red]❌ Error: Input error[/red]" in str(call)
-                ]
-                assert len(error_calls) > 0
-
-    @pytest.mark.asyncio
-    async def test_send_message_success(self, config):
+        ), patch.object(chat.console, "print") as mock_print:
+            await chat._interactive_loop()
+
+            # Should print error message
+            assert any(
+                "[red]❌ Error: Input error[/red]" in str(call)
+                for call in mock_print.call_args_list
+            )
+
+    async def test_send_message_success(self, chat):
         """Test successful message sending."""
-        chat = ChatInterface(config)
-        chat.api_client = AsyncMock()
+        chat.api_client = SimpleNamespace()
         chat.session_id = "test-session"
 
         # Mock streaming response
@@ -215,29 +303,112 @@ class TestChatInterface:
                 {"type": "tool_use", "description": "searching"}
             )
 
-    @pytest.mark.asyncio
-    async def test_send_message_no_client(self, config):
-        """Test send message without initialized client."""
-        chat = ChatInterface(config)
+    async def test_send_message_reuses_finished_paragraphs(self, chat):
+        """Test finished paragraphs are parsed once and the final render is whole."""
+        from rich.console import Group
+        from rich.live import Live
+        from rich.markdown import Markdown
+
+        chat.api_client = SimpleNamespace()
+        chat.session_id = "test-session"
+
+        async def mock_send_message(session_id, message):
+            yield {"type": "message", "content": "First paragraph.\n\n"}
+            yield {"type": "message", "content": "Second "}
+            yield {"type": "message", "content": "paragraph."}
+
+        chat.api_client.send_message = mock_send_message
+
+        updates = []
+        with patch("specsmith_cli.chat.RENDER_INTERVAL", 0), patch.object(
+            Live,
+            "update",
+            autospec=True,
+            side_effect=lambda _, r, **kw: updates.append(r),
+        ):
+            await chat._send_message("test message")
+
+        groups = [u for u in updates if isinstance(u, Group)]
+        assert groups
+        prefixes = {id(g.renderables[0]) for g in groups}
+        assert len(prefixes) == 1
+
+        final = updates[-1]
+        assert isinstance(final, Markdown)
+        assert final.markup == "First paragraph.\n\nSecond paragraph."
+
+    async def test_send_message_flushes_before_other_actions(self, chat):
+        """Test throttled content is rendered before a tool_use note prints."""
+        from rich.live import Live
+
+        chat.api_client = SimpleNamespace()
+        chat.session_id = "test-session"
+
+        async def mock_send_message(session_id, message):
+            yield {"type": "message", "content": "Looking"}
+            yield {"type": "message", "content": " it up"}
+            yield {"type": "tool_use", "description": "searching"}
+
+        chat.api_client.send_message = mock_send_message
+
+        events = []
+        with patch("specsmith_cli.chat.RENDER_INTERVAL", 3600), patch.object(
+            Live,
+            "update",
+            autospec=True,
+            side_effect=lambda _, r, **kw: events.append(getattr(r, "markup", None)),
+        ), patch.object(
+            chat, "_handle_action", side_effect=lambda a: events.append(a["type"])
+        ):
+            await chat._send_message("test message")
+
+        assert events.index("Looking it up") < events.index("tool_use")
+
+    async def test_send_message_renders_throttled_text_during_stall(self, chat):
+        """Test text held back by the throttle shows up while the stream stalls."""
+        from rich.live import Live
+
+        chat.api_client = SimpleNamespace()
+        chat.session_id = "test-session"
+        shown_during_stall = []
+
+        async def mock_send_message(session_id, message):
+            yield {"type": "message", "content": "Hello"}
+            yield {"type": "message", "content": " world"}
+            await asyncio.sleep(0.2)
+            shown_during_stall.extend(updates)
+            yield {"type": "message", "content": "!"}
+
+        chat.api_client.send_message = mock_send_message
 
+        updates = []
+        with patch("specsmith_cli.chat.RENDER_INTERVAL", 0.05), patch.object(
+            Live,
+            "update",
+            autospec=True,
+            side_effect=lambda _, r, **kw: updates.append(getattr(r, "markup", None)),
+        ):
+            await chat._send_message("test message")
+
+        assert shown_during_stall == ["Hello", "Hello world"]
+        assert updates[-1] == "Hello world!"
+
+    async def test_send_message_no_client(self, chat):
+        """Test send message without initialized client."""
         with pytest.raises(ValueError, match="API client or session not initialized"):
             await chat._send_message("test message")
 
-    @pytest.mark.asyncio
-    async def test_send_message_no_session(self, config):
+    async def test_send_message_no_session(self, chat):
         """Test send message without session."""
-        chat = ChatInterface(config)
-        chat.api_client = AsyncMock()
+        chat.api_client = SimpleNamespace()
         # session_id remains None
 
         with pytest.raises(ValueError, match="API client or session not initialized"):
             await chat._send_message("test message")
 
-    @pytest.mark.asyncio
-    async def test_send_message_exception(self, config):
+    async def test_send_message_exception(self, chat):
         """Test send message with exception."""
-        chat = ChatInterface(config)
-        chat.api_client = AsyncMock()
+        chat.api_client = SimpleNamespace()
         chat.session_id = "test-session"
 
         # Mock exception during message sending
@@ -253,19 +424,13 @@ class TestChatInterface:
             # Should print error message
             mock_print.assert_called_with("[red]❌ Error: Send error[/red]")
 
-    @pytest.mark.asyncio
-    async def test_handle_action_message(self, config):
+    async def test_handle_action_message(self, chat):
         """Test handling message action."""
-        chat = ChatInterface(config)
-
         # Message actions are handled in _send_message, so this should do nothing
         await chat._handle_action({"type": "message", "content": "test"})
 
-    @pytest.mark.asyncio
-    async def test_handle_action_file(self, config):
+    async def test_handle_action_file(self, chat):
         """Test handling file action."""
-        chat = ChatInterface(config)
-
         with patch.object(chat, "_handle_file_action") as mock_handle_file:
             await chat._handle_action({"type": "file", "filename": "test.py"})
 
@@ -273,33 +438,29 @@ class TestChatInterface:
                 {"type": "file", "filename": "test.py"}
             )
 
-    @pytest.mark.asyncio
-    async def test_handle_action_tool_use(self, config):
+    @pytest.mark.parametrize(
+        "action,expected",
+        [
+            # With description
+            (
+                {"type": "tool_use", "description": "searching files"},
+                "[dim]( searching files )…[/dim]",
+            ),
+            # With tool_name fallback
+            ({"type": "tool_use", "tool_name": "search"}, "[dim]( search )…[/dim]"),
+            # With neither (fallback to "tool")
+            ({"type": "tool_use"}, "[dim]( tool )…[/dim]"),
+        ],
+    )
+    async def test_handle_action_tool_use(self, chat, action, expected):
         """Test handling tool use action."""
-        chat = ChatInterface(config)
-
         with patch.object(chat.console, "print") as mock_print:
-            # Test with description
-            await chat._handle_action(
-                {"type": "tool_use", "description": "searching files"}
-            )
-            mock_print.assert_called_with("[dim]( searching files )…[/dim]")
-
-            # Test with tool_name fallback
-            mock_print.reset_mock()
-            await chat._handle_action({"type": "tool_use", "tool_name": "search"})
-            mock_print.assert_called_with("[dim]( search )…[/dim]")
+            await chat._handle_action(action)
 
-            # Test with neither (fallback to "tool")
-            mock_print.reset_mock()
-            await chat._handle_action({"type": "tool_use"})
-            mock_print.assert_called_with("[dim]( tool )…[/dim]")
+        mock_print.assert_called_once_with(expected)
 
-    @pytest.mark.asyncio
-    async def test_handle_action_limit_message(self, config):
+    async def test_handle_action_limit_message(self, chat):
         """Test handling limit message action."""
-        chat = ChatInterface(config)
-
         with patch.object(chat.console, "print") as mock_print:
             await chat._handle_action(
                 {"type": "limit_message", "content": "Rate limit reached"}
@@ -307,214 +468,294 @@ class TestChatInterface:
 
             mock_print.assert_called_with("[dim]Rate limit reached[/dim]")
 
-    @pytest.mark.asyncio
-    async def test_handle_action_unknown_debug(self, debug_config):
+    async def test_handle_action_unknown_debug(self, debug_chat):
         """Test handling unknown action with debug enabled."""
-        chat = ChatInterface(debug_config)
-
-        with patch.object(chat.console, "print") as mock_print:
+        with patch.object(debug_chat.console, "print") as mock_print:
             unknown_action = {"type": "unknown", "data": "test"}
-            await chat._handle_action(unknown_action)
+            await debug_chat._handle_action(unknown_action)
 
             mock_print.assert_called_with(
                 f"[yellow]Unknown action type: {unknown_action}[/yellow]"
             )
 
-    @pytest.mark.asyncio
-    async def test_handle_action_unknown_no_debug(self, config):
+    async def test_handle_action_unknown_no_debug(self, chat):
         """Test handling unknown action with debug disabled."""
-        chat = ChatInterface(config)
-
         with patch.object(chat.console, "print") as mock_print:
             await chat._handle_action({"type": "unknown", "data": "test"})
 
             # Should not print anything when debug is False
             mock_print.assert_not_called()
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_new_file_save(self, config, tmp_path):
-        """Test handling file action for new file with save confirmation."""
-        chat = ChatInterface(config)
-
+    @pytest.mark.parametrize("confirm", [True, False], indirect=True)
+    async def test_handle_file_action_new_file(self, chat, tmp_path, confirm):
+        """Test handling file action for a new file, saved or skipped."""
         test_file = tmp_path / "test.py"
         file_content = "print('Hello, World!')"
 
         action = {"filename": str(test_file), "content": file_content}
 
-        with patch("rich.prompt.Confirm.ask", return_value=True):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._handle_file_action(action)
+        with patch.object(chat.console, "print") as mock_print:
+            await chat._handle_file_action(action)
 
-                # File should be created
-                assert test_file.exists()
-                assert test_file.read_text() == file_content
+        if confirm:
+            # File should be created
+            assert test_file.read_text() == file_content
+            mock_print.assert_called_with(f"[green]✅ Saved {test_file}[/green]")
+        else:
+            # File should not be created
+            assert not test_file.exists()
+            mock_print.assert_called_with(
+                f"[yellow]Skipped saving {test_file}[/yellow]"
+            )
 
-                # Should print success message
-                mock_print.assert_called_with(f"[green]✅ Saved {test_file}[/green]")
+    @pytest.mark.parametrize("confirm", [True, False], indirect=True)
+    async def test_handle_file_action_existing_file(self, chat, tmp_path, confirm):
+        """Test handling file action for an existing file, overwritten or kept."""
+        test_file = tmp_path / "existing.py"
+        test_file.write_text("original content")
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_new_file_skip(self, config, tmp_path):
-        """Test handling file action for new file with skip."""
-        chat = ChatInterface(config)
+        action = {"filename": str(test_file), "content": "new content"}
 
-        test_file = tmp_path / "test.py"
+        with patch.object(chat.console, "print") as mock_print:
+            await chat._handle_file_action(action)
 
-        action = {"filename": str(test_file), "content": "print('Hello, World!')"}
+        if confirm:
+            # File should be overwritten
+            assert test_file.read_text() == "new content"
+            mock_print.assert_called_with(f"[green]✅ Saved {test_file}[/green]")
+        else:
+            # File should remain unchanged
+            assert test_file.read_text() == "original content"
+            mock_print.assert_called_with(
+                f"[yellow]Skipped saving {test_file}[/yellow]"
+            )
 
-        with patch("rich.prompt.Confirm.ask", return_value=False):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._handle_file_action(action)
+    async def test_handle_file_action_missing_data(self, chat):
+        """Test handling file action with missing filename or content."""
+        # Missing filename, missing content, and both missing
+        results = await asyncio.gather(
+            chat._handle_file_action({"content": "test"}),
+            chat._handle_file_action({"filename": "test.py"}),
+            chat._handle_file_action({}),
+        )
+
+        # Should skip each action without raising
+        assert results == [False, False, False]
+
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_directory_creation(self, chat, tmp_path):
+        """Test handling file action with directory creation."""
+        nested_file = tmp_path / "subdir" / "nested" / "test.py"
 
-                # File should not be created
-                assert not test_file.exists()
+        action = {"filename": str(nested_file), "content": "test content"}
 
-                # Should print skip message
-                mock_print.assert_called_with(
-                    f"[yellow]Skipped saving {test_file}[/yellow]"
-                )
+        await chat._handle_file_action(action)
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_existing_file_overwrite(self, config, tmp_path):
-        """Test handling file action for existing file with overwrite."""
-        chat = ChatInterface(config)
+        # File and directories should be created
+        assert nested_file.exists()
+        assert nested_file.read_text() == "test content"
 
-        test_file = tmp_path / "existing.py"
-        test_file.write_text("old content")
+    @pytest.mark.usefixtures("confirm")
+    async def test_send_message_checks_pending_files_once(self, chat, tmp_path):
+        """Test deferred file saves check each distinct filename exactly once."""
+        chat.api_client = SimpleNamespace()
+        chat.session_id = "test-session"
 
-        new_content = "new content"
-        action = {"filename": str(test_file), "content": new_content}
+        existing = tmp_path / "existing.py"
+        existing.write_text("old")
+        new_file = tmp_path / "new.py"
 
-        with patch("rich.prompt.Confirm.ask", return_value=True):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._handle_file_action(action)
+        async def mock_send_message(session_id, message):
+            yield {"type": "file", "filename": str(existing), "content": "a"}
+            yield {"type": "file", "filename": str(new_file), "content": "b"}
+            yield {"type": "file", "filename": str(new_file), "content": "c"}
 
-                # File should be overwritten
-                assert test_file.read_text() == new_content
+        chat.api_client.send_message = mock_send_message
 
-                # Should print success message
-                mock_print.assert_called_with(f"[green]✅ Saved {test_file}[/green]")
+        with patch(
+            "specsmith_cli.utils.os.path.lexists", wraps=os.path.lexists
+        ) as mock_lexists, patch.object(
+            chat, "_handle_file_action", wraps=chat._handle_file_action
+        ) as mock_handle:
+            await chat._send_message("test message")
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_existing_file_no_overwrite(
-        self, config, tmp_path
-    ):
-        """Test handling file action for existing file without overwrite."""
-        chat = ChatInterface(config)
+        assert sorted(c.args[0] for c in mock_lexists.call_args_list) == sorted(
+            [str(existing), str(new_file)]
+        )
+        assert [c.kwargs["exists"] for c in mock_handle.call_args_list] == [
+            True,
+            False,
+            True,
+        ]
+        assert new_file.read_text() == "c"
+
+    async def test_send_message_existing_file_differs_in_case(self, chat, tmp_path):
+        """Test a name the listing lacks still counts if the filesystem finds it."""
+        chat.api_client = SimpleNamespace()
+        chat.session_id = "test-session"
+        (tmp_path / "readme.md").write_text("old")
+        upper = str(tmp_path / "README.md")
 
-        test_file = tmp_path / "existing.py"
-        original_content = "original content"
-        test_file.write_text(original_content)
+        async def mock_send_message(session_id, message):
+            yield {"type": "file", "filename": upper, "content": "new"}
 
-        action = {"filename": str(test_file), "content": "new content"}
+        chat.api_client.send_message = mock_send_message
 
-        with patch("rich.prompt.Confirm.ask", return_value=False):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._handle_file_action(action)
+        # Answer as a case-insensitive filesystem would
+        with patch(
+            "specsmith_cli.utils.os.path.lexists", side_effect=lambda p: p == upper
+        ), patch.object(chat, "_handle_file_action", return_value=False) as mock_handle:
+            await chat._send_message("test message")
 
-                # File should remain unchanged
-                assert test_file.read_text() == original_content
+        assert mock_handle.call_args.kwargs["exists"] is True
 
-                # Should print skip message
-                mock_print.assert_called_with(
-                    f"[yellow]Skipped saving {test_file}[/yellow]"
-                )
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_overwrite_is_atomic(self, chat, tmp_path):
+        """Test overwriting keeps permissions and leaves no temporary file."""
+        target = tmp_path / "run.sh"
+        target.write_text("old")
+        target.chmod(0o755)
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_missing_data(self, config):
-        """Test handling file action with missing filename or content."""
-        chat = ChatInterface(config)
+        action = {"filename": str(target), "content": "line1\nline2\n"}
 
-        # Test missing filename
-        await chat._handle_file_action({"content": "test"})
+        assert await chat._handle_file_action(action)
 
-        # Test missing content
-        await chat._handle_file_action({"filename": "test.py"})
+        assert target.read_bytes() == b"line1\nline2\n"
+        assert target.stat().st_mode & 0o777 == 0o755
+        assert list(tmp_path.iterdir()) == [target]
 
-        # Test both missing
-        await chat._handle_file_action({})
+    @pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_new_file_follows_umask(self, chat, tmp_path):
+        """Test a newly saved file gets the mode the current umask allows."""
+        target = tmp_path / "new.py"
+        old_umask = os.umask(0o027)
+        try:
+            assert await chat._handle_file_action(
+                {"filename": str(target), "content": "new"}
+            )
+        finally:
+            os.umask(old_umask)
 
-        # Should not raise any exceptions
+        assert target.stat().st_mode & 0o777 == 0o640
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_directory_creation(self, config, tmp_path):
-        """Test handling file action with directory creation."""
-        chat = ChatInterface(config)
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_bare_filename_skips_mkdir(
+        self, chat, tmp_path, monkeypatch
+    ):
+        """Test saving into an existing directory never calls mkdir."""
+        monkeypatch.chdir(tmp_path)
 
-        nested_file = tmp_path / "subdir" / "nested" / "test.py"
+        with patch("pathlib.Path.mkdir") as mock_mkdir:
+            assert await chat._handle_file_action(
+                {"filename": "flat.py", "content": "new"}
+            )
 
-        action = {"filename": str(nested_file), "content": "test content"}
+        mock_mkdir.assert_not_called()
+        assert (tmp_path / "flat.py").read_text() == "new"
 
-        with patch("rich.prompt.Confirm.ask", return_value=True):
-            await chat._handle_file_action(action)
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_keeps_tmp_named_file(self, chat, tmp_path):
+        """Test saving never touches an existing file named like a temp file."""
+        target = tmp_path / "out.py"
+        neighbour = tmp_path / "out.py.tmp"
+        neighbour.write_text("keep me")
 
-            # File and directories should be created
-            assert nested_file.exists()
-            assert nested_file.read_text() == "test content"
+        assert await chat._handle_file_action(
+            {"filename": str(target), "content": "new"}
+        )
 
-    @pytest.mark.asyncio
-    async def test_handle_file_action_write_error(self, config):
-        """Test handling file action with write error."""
-        chat = ChatInterface(config)
+        assert target.read_text() == "new"
+        assert neighbour.read_text() == "keep me"
+        assert sorted(tmp_path.iterdir()) == [target, neighbour]
 
-        # Try to write to an invalid path
-        action = {"filename": "/invalid/path/test.py", "content": "test content"}
+    @pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges")
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_writes_through_symlink(self, chat, tmp_path):
+        """Test saving to a symlink updates its target and keeps the link."""
+        target = tmp_path / "target.txt"
+        target.write_text("old")
+        link = tmp_path / "link.txt"
+        link.symlink_to(target)
 
-        with patch("rich.prompt.Confirm.ask", return_value=True):
-            with patch.object(chat.console, "print") as mock_print:
-                await chat._handle_file_action(action)
+        assert await chat._handle_file_action({"filename": str(link), "content": "new"})
 
-                # Should print error message
-                error_calls = [
-                    call
-                    for call in mock_print.call_args_list
-                    if "❌ Failed to save" in str(call)
-                ]
-                assert len(error_calls) > 0
+        assert link.is_symlink()
+        assert target.read_text() == "new"
 
-    @pytest.mark.asyncio
-    async def test_send_single_message_success(self, config):
-        """Test send_single_message method."""
-        chat = ChatInterface(config)
+    @pytest.mark.usefixtures("confirm")
+    async def test_handle_file_action_write_error(self, chat, tmp_path):
+        """Test handling file action with write error."""
+        # A regular file where a parent directory should be can never be
+        # written through, whichever user runs the tests
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        action = {"filename": str(blocker / "test.py"), "content": "test content"}
 
-        with patch("specsmith_cli.chat.SpecSmithAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-            mock_client.create_session.return_value = "test-session"
+        with patch.object(chat.console, "print") as mock_print:
+            await chat._handle_file_action(action)
 
-            with patch.object(chat, "_send_message") as mock_send:
-                await chat.send_single_message("Hello")
+            # Should print error message
+            assert any(
+                "❌ Failed to save" in str(call) for call in mock_print.call_args_list
+            )
 
-                # Should create session and send message
-                mock_client.create_session.assert_called_once()
-                mock_send.assert_called_once_with("Hello")
-                mock_client.aclose.assert_called_once()
+    async def test_send_single_message_success(self, chat, mock_client):
+        """Test send_single_message method."""
+        mock_client.create_session.return_value = "test-session"
 
-    @pytest.mark.asyncio
-    async def test_send_single_message_exception(self, config):
+        with patch.object(chat, "_send_message") as mock_send:
+            await chat.send_single_message("Hello")
+
+        # Should create session and send message
+        mock_client.create_session.assert_called_once()
+        mock_send.assert_called_once_with("Hello")
+        mock_client.aclose.assert_called_once()
+
+    async def test_send_single_message_exception(self, chat, mock_client):
         """Test send_single_message with exception."""
-        chat = ChatInterface(config)
+        mock_client.create_session.side_effect = Exception("Session error")
+
+        with patch.object(chat.console, "print") as mock_print:
+            await chat.send_single_message("Hello")
+
+        # Should print error and still close the client
+        mock_print.assert_called_with("[red]❌ Error: Session error[/red]")
+        mock_client.aclose.assert_called_once()
+
+    async def test_send_single_message_uses_cached_session(self, config, mock_client):
+        """Test a cached session skips create_session and is rotated on 404."""
+        config.save_cached_session("stale-session")
+        mock_client.create_session.return_value = "fresh-session"
+
+        with patch.object(
+            ChatInterface,
+            "_send_message",
+            side_effect=[SessionNotFoundError("Session not found"), None],
+        ) as mock_send:
+            chat = ChatInterface(config)
+            await chat.send_single_message("Hello")
 
-        with patch("specsmith_cli.chat.SpecSmithAPIClient") as mock_client_class:
-            mock_client = AsyncMock()
-            mock_client_class.return_value = mock_client
-            mock_client.create_session.side_effect = Exception("Session error")
+        assert mock_send.call_count == 2
+        mock_client.create_session.assert_called_once()
+        assert chat.session_id == "fresh-session"
+        assert config.load_cached_session() == "fresh-session"
 
-            with patch.object(chat.console, "print") as mock_print:
-                await chat.send_single_message("Hello")
+        with patch.object(ChatInterface, "_send_message") as mock_send:
+            await ChatInterface(config).send_single_message("Again")
 
-                # Should print error and close client
-                mock_print.assert_called_with("[red]❌ Error: Session error[/red]")
-                mock_client.aclose.assert_called_once()
+        mock_send.assert_called_once_with("Again")
+        mock_client.create_session.assert_called_once()
 
 
 class TestRunChat:
     """Test cases for run_chat function."""
 
-    @pytest.mark.asyncio
     async def test_run_chat(self, config):
         """Test run_chat function."""
         with patch("specsmith_cli.chat.ChatInterface") as mock_chat_class:
-            mock_chat = AsyncMock()
+            # Only start() is awaited, so only it needs to be async
+            mock_chat = Mock(start=AsyncMock())
             mock_chat_class.return_value = mock_chat
 
             await run_chat(config)
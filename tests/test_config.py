@@ -1,12 +1,19 @@
 """Tests for the configuration module."""
 
+import base64
+import io
 import os
-import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from specsmith_cli.config import Config, load_config, validate_credentials
+from specsmith_cli.config import (
+    Config,
+    load_config,
+    setup_credentials_interactive,
+    validate_credentials,
+)
 
 
 def test_config_auth_header():
@@ -21,8 +28,6 @@ def test_config_auth_header():
     assert auth_header.startswith("Basic ")
 
     # Decode and verify
-    import base64
-
     encoded_part = auth_header[6:]  # Remove "Basic "
     decoded = base64.b64decode(encoded_part).decode()
     assert decoded == "test-id:test-token"
@@ -40,73 +45,82 @@ def test_get_credentials_file():
     assert cred_file == Path.home() / ".specsmith" / "credentials"
 
 
-def test_save_and_load_credentials():
+def test_save_and_load_credentials(tmp_path, monkeypatch):
     """Test saving and loading credentials from file."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Mock the home directory
-        original_home = Path.home
-        Path.home = lambda: Path(temp_dir)
-
-        try:
-            # Create a config and save it
-            config = Config(
-                api_url="http://localhost:8000",
-                access_key_id="test-id",
-                access_key_token="test-token",
-                debug=False,
-            )
-            config.save_to_file()
-
-            # Test loading credentials
-            loaded_config = Config.load_from_file()
-            assert loaded_config is not None
-            assert loaded_config.access_key_id == "test-id"
-            assert loaded_config.access_key_token == "test-token"
-            assert loaded_config.api_url == "http://localhost:8000"
-            assert loaded_config.debug is False
-
-        finally:
-            # Restore original home function
-            Path.home = original_home
-
-
-def test_load_credentials_from_nonexistent_file():
+    # Mock the home directory
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+
+    # Create a config and save it
+    config = Config(
+        api_url="http://localhost:8000",
+        access_key_id="test-id",
+        access_key_token="test-token",
+        debug=False,
+    )
+    config.save_to_file()
+
+    # Test loading credentials
+    loaded_config = Config.load_from_file()
+    assert loaded_config is not None
+    assert loaded_config.access_key_id == "test-id"
+    assert loaded_config.access_key_token == "test-token"
+    assert loaded_config.api_url == "http://localhost:8000"
+    assert loaded_config.debug is False
+
+
+def test_load_credentials_reads_unchanged_file_once(tmp_path, monkeypatch):
+    """Test repeated loads reuse the parsed file until it is saved again."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    Config("http://localhost:8000", "test-id", "test-token").save_to_file()
+
+    with patch("builtins.open", wraps=open) as mock_open:
+        assert Config.load_from_file().access_key_id == "test-id"
+        assert Config.load_from_file().access_key_id == "test-id"
+    assert mock_open.call_count == 1
+
+    Config("http://localhost:8000", "new-id", "test-token").save_to_file()
+    assert Config.load_from_file().access_key_id == "new-id"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+@pytest.mark.parametrize("existing", [False, True])
+def test_save_credentials_owner_only(tmp_path, monkeypatch, existing):
+    """Test saved credentials are readable only by their owner, even on re-save."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    credentials_file = Config.get_credentials_file()
+    if existing:
+        # Files written by older versions were created with the umask mode
+        credentials_file.parent.mkdir()
+        credentials_file.write_text("access_key_id=old\n")
+        credentials_file.chmod(0o644)
+
+    Config("http://localhost:8000", "test-id", "test-token").save_to_file()
+
+    assert credentials_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_load_credentials_from_nonexistent_file(tmp_path, monkeypatch):
     """Test loading credentials when file doesn't exist."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Mock the home directory
-        original_home = Path.home
-        Path.home = lambda: Path(temp_dir)
+    # Mock the home directory
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
 
-        try:
-            config = Config.load_from_file()
-            assert config is None
-        finally:
-            Path.home = original_home
+    config = Config.load_from_file()
+    assert config is None
 
 
-def test_load_config_with_environment():
+def test_load_config_with_environment(monkeypatch):
     """Test loading config from environment variables."""
     # Set environment variables
-    os.environ["SPECSMITH_API_URL"] = "http://test-api:9000"
-    os.environ["SPECSMITH_ACCESS_KEY_ID"] = "env-id"
-    os.environ["SPECSMITH_ACCESS_KEY_TOKEN"] = "env-token"
-    os.environ["SPECSMITH_DEBUG"] = "true"
-
-    try:
-        config = load_config()
-        assert config.api_url == "http://test-api:9000"
-        assert config.access_key_id == "env-id"
-        assert config.access_key_token == "env-token"
-        assert config.debug is True
-    finally:
-        # Clean up environment variables
-        for key in [
-            "SPECSMITH_API_URL",
-            "SPECSMITH_ACCESS_KEY_ID",
-            "SPECSMITH_ACCESS_KEY_TOKEN",
-            "SPECSMITH_DEBUG",
-        ]:
-            os.environ.pop(key, None)
+    monkeypatch.setenv("SPECSMITH_API_URL", "http://test-api:9000")
+    monkeypatch.setenv("SPECSMITH_ACCESS_KEY_ID", "env-id")
+    monkeypatch.setenv("SPECSMITH_ACCESS_KEY_TOKEN", "env-token")
+    monkeypatch.setenv("SPECSMITH_DEBUG", "true")
+
+    config = load_config()
+    assert config.api_url == "http://test-api:9000"
+    assert config.access_key_id == "env-id"
+    assert config.access_key_token == "env-token"
+    assert config.debug is True
 
 
 def test_load_config_with_arguments():
@@ -124,28 +138,16 @@ def test_load_config_with_arguments():
     assert config.debug is True
 
 
-def test_load_config_missing_credentials():
+def test_load_config_missing_credentials(monkeypatch):
     """Test loading config when credentials are missing."""
-    # Temporarily remove environment variables
-    original_env = {}
-    for key in ["SPECSMITH_ACCESS_KEY_ID", "SPECSMITH_ACCESS_KEY_TOKEN"]:
-        if key in os.environ:
-            original_env[key] = os.environ[key]
-            del os.environ[key]
+    monkeypatch.delenv("SPECSMITH_ACCESS_KEY_ID", raising=False)
+    monkeypatch.delenv("SPECSMITH_ACCESS_KEY_TOKEN", raising=False)
 
     # Mock the Config.load_from_file to return None (no file)
-    original_load_from_file = Config.load_from_file
-    try:
-        # Mock the method to return None
-        Config.load_from_file = classmethod(lambda cls: None)
+    monkeypatch.setattr(Config, "load_from_file", classmethod(lambda cls: None))
 
-        with pytest.raises(ValueError, match="API credentials not found"):
-            load_config()
-    finally:
-        # Restore environment variables and method
-        for key, value in original_env.items():
-            os.environ[key] = value
-        Config.load_from_file = original_load_from_file
+    with pytest.raises(ValueError, match="API credentials not found"):
+        load_config()
 
 
 def test_validate_credentials():
@@ -178,3 +180,88 @@ def test_validate_credentials_invalid():
     # Both should be invalid
     assert validate_credentials(config) is False
     assert validate_credentials(config2) is False
+
+
+def test_session_cache_roundtrip(tmp_path, monkeypatch):
+    """Test a cached session is reused only for the same credentials."""
+    monkeypatch.setattr(Config, "get_config_dir", classmethod(lambda cls: tmp_path))
+    config = Config("http://localhost:8000", "test-id", "test-token")
+
+    assert config.load_cached_session() is None
+
+    config.save_cached_session("session-1")
+    assert config.load_cached_session() == "session-1"
+
+    other = Config("http://localhost:8000", "other-id", "test-token")
+    assert other.load_cached_session() is None
+
+    Config.clear_cached_session()
+    assert config.load_cached_session() is None
+
+
+def test_session_cache_expires(tmp_path, monkeypatch):
+    """Test an expired cached session is ignored."""
+    monkeypatch.setattr(Config, "get_config_dir", classmethod(lambda cls: tmp_path))
+    monkeypatch.setattr("specsmith_cli.config.SESSION_CACHE_TTL", -1)
+    config = Config("http://localhost:8000", "test-id", "test-token")
+
+    config.save_cached_session("session-1")
+    assert config.load_cached_session() is None
+
+
+@pytest.mark.parametrize(
+    "content", ["[]", '"session-1"', '{"expires_at": "soon"}', "not json"]
+)
+def test_session_cache_malformed(tmp_path, monkeypatch, content):
+    """Test a malformed session cache is ignored rather than raising."""
+    monkeypatch.setattr(Config, "get_config_dir", classmethod(lambda cls: tmp_path))
+    Config.get_session_cache_file().write_text(content)
+    config = Config("http://localhost:8000", "test-id", "test-token")
+
+    assert config.load_cached_session() is None
+
+    config.save_cached_session("session-1")
+    assert config.load_cached_session() == "session-1"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions")
+def test_session_cache_owner_only(tmp_path, monkeypatch):
+    """Test the session cache is readable only by its owner, even on re-save."""
+    monkeypatch.setattr(Config, "get_config_dir", classmethod(lambda cls: tmp_path))
+    cache_file = Config.get_session_cache_file()
+    cache_file.write_text("{}")
+    cache_file.chmod(0o644)
+
+    Config("http://localhost:8000", "test-id", "test-token").save_cached_session(
+        "session-1"
+    )
+
+    assert cache_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_setup_credentials_from_piped_stdin(tmp_path, monkeypatch):
+    """Test setup reads the key ID and token from non-interactive stdin."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    monkeypatch.setattr("sys.stdin", io.StringIO("piped-id\npiped-token\n"))
+
+    setup_credentials_interactive()
+
+    loaded = Config.load_from_file()
+    assert loaded.access_key_id == "piped-id"
+    assert loaded.access_key_token == "piped-token"
+
+
+@pytest.mark.parametrize("stdin", ["", "piped-id\n"])
+def test_setup_credentials_rejects_incomplete_stdin(tmp_path, monkeypatch, stdin):
+    """Test setup keeps existing credentials when stdin lacks the ID or token."""
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    Config("http://localhost:8000", "test-id", "test-token").save_to_file()
+    monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+
+    with pytest.raises(SystemExit) as exc_info:
+        setup_credentials_interactive()
+
+    assert exc_info.value.code == 1
+    loaded = Config.load_from_file()
+    assert loaded.access_key_id == "test-id"
+    assert loaded.access_key_token == "test-token"
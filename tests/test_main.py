@@ -1,8 +1,8 @@
 """Tests for the Click CLI entry points in main.py."""
 
-import os
 from typing import Optional
 
+import pytest
 from click.testing import CliRunner
 
 from specsmith_cli.main import main
@@ -14,7 +14,8 @@ def _env_with_creds(
     key_token: Optional[str] = "test-token",
     debug: Optional[bool] = False,
 ):
-    env = os.environ.copy()
+    # CliRunner.invoke overlays env on os.environ, so only overrides are needed
+    env = {}
     if api_url is not None:
         env["SPECSMITH_API_URL"] = api_url
     if key_id is not None:
@@ -26,19 +27,30 @@ def _env_with_creds(
     return env
 
 
-def test_main_invokes_chat_by_default(monkeypatch):
-    runner = CliRunner()
+@pytest.fixture(scope="session")
+def runner():
+    """A CliRunner shared by all tests; each invoke isolates its own I/O."""
+    return CliRunner()
 
+
+@pytest.fixture(scope="module")
+def base_env():
+    """Environment with the default test credentials."""
+    return _env_with_creds()
+
+
+def test_main_invokes_chat_by_default(runner, base_env, monkeypatch):
     # Prevent starting the interactive chat; intercept _start_chat via subcommand
     # Instead run the lightweight `version` subcommand to verify wiring
-    result = runner.invoke(main, ["version"], env=_env_with_creds())
+    result = runner.invoke(main, ["version"], env=base_env)
     assert result.exit_code == 0
     assert "Specsmith-CLI (v" in result.output
 
 
-def test_main_config_command_outputs(monkeypatch):
-    runner = CliRunner()
-    result = runner.invoke(main, ["config"], env=_env_with_creds(debug=True))
+def test_main_config_command_outputs(runner, base_env, monkeypatch):
+    result = runner.invoke(
+        main, ["config"], env={**base_env, "SPECSMITH_DEBUG": "true"}
+    )
     assert result.exit_code == 0
     assert "Current Configuration" in result.output
     assert "API URL:" in result.output
@@ -46,55 +58,41 @@ def test_main_config_command_outputs(monkeypatch):
     assert "Debug Mode: True" in result.output
 
 
-def test_main_test_command_success(monkeypatch):
-    runner = CliRunner()
+class _DummyClient:
+    """Stand-in API client whose connection test returns a fixed result."""
 
-    # Mock the API client inside the command path by setting env and using monkeypatch
-    class _Dummy:
-        async def __aenter__(self):
-            return self
+    def __init__(self, connected: bool):
+        self.connected = connected
 
-        async def __aexit__(self, *_):
-            return False
+    async def __aenter__(self):
+        return self
 
-        async def test_connection(self):
-            return True
+    async def __aexit__(self, *_):
+        return False
 
-    # Patch the import used in main
-    import specsmith_cli.main as main_mod
-
-    monkeypatch.setattr(main_mod, "SpecSmithAPIClient", lambda *_args, **_kw: _Dummy())
-
-    result = runner.invoke(main, ["test"], env=_env_with_creds())
-    assert result.exit_code == 0
-    assert "Connection successful" in result.output
+    async def test_connection(self):
+        return self.connected
 
 
-def test_main_test_command_failure(monkeypatch):
-    runner = CliRunner()
-
-    class _Dummy:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, *_):
-            return False
-
-        async def test_connection(self):
-            return False
-
-    import specsmith_cli.main as main_mod
-
-    monkeypatch.setattr(main_mod, "SpecSmithAPIClient", lambda *_args, **_kw: _Dummy())
-
-    result = runner.invoke(main, ["test"], env=_env_with_creds())
-    assert result.exit_code != 0
-    assert "Connection failed" in result.output
+@pytest.mark.parametrize(
+    "connected,expected_exit,expected_text",
+    [(True, 0, "Connection successful"), (False, 1, "Connection failed")],
+)
+def test_main_test_command(
+    runner, base_env, monkeypatch, connected, expected_exit, expected_text
+):
+    # Patch the client the command imports when it runs
+    monkeypatch.setattr(
+        "specsmith_cli.api_client.SpecSmithAPIClient",
+        lambda *_args, **_kw: _DummyClient(connected),
+    )
 
+    result = runner.invoke(main, ["test"], env=base_env)
+    assert result.exit_code == expected_exit
+    assert expected_text in result.output
 
-def test_main_setup_shows_header(monkeypatch):
-    runner = CliRunner()
 
+def test_main_setup_shows_header(runner, base_env, monkeypatch):
     # Avoid interactive prompts by patching setup function
     import specsmith_cli.main as main_mod
 
@@ -105,14 +103,13 @@ def test_main_setup_shows_header(monkeypatch):
 
     monkeypatch.setattr(main_mod, "setup_credentials_interactive", _fake_setup)
 
-    result = runner.invoke(main, ["setup"], env=_env_with_creds())
+    result = runner.invoke(main, ["setup"], env=base_env)
     assert result.exit_code == 0
     assert called["setup"] is True
     assert "Specsmith CLI Setup" in result.output
 
 
-def test_main_invalid_config_exits(monkeypatch):
-    runner = CliRunner()
+def test_main_invalid_config_exits(runner, monkeypatch):
     # Remove credentials to trigger config error path and prevent file reads
     env = _env_with_creds(key_id=None, key_token=None)
     import specsmith_cli.config as cfg
@@ -122,3 +119,31 @@ def test_main_invalid_config_exits(monkeypatch):
     result = runner.invoke(main, ["chat"], env=env)
     assert result.exit_code != 0
     assert "Configuration error" in result.output
+
+
+def test_run_falls_back_to_asyncio_without_uvloop(monkeypatch):
+    import sys
+
+    from specsmith_cli import main as main_mod
+
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    async def answer():
+        return 42
+
+    assert main_mod._run(answer()) == 42
+
+
+def test_import_skips_heavy_modules():
+    """Test importing the CLI does not load asyncio, httpx or Rich's prompts."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, specsmith_cli.main; "
+        "print(sorted({'asyncio', 'httpx', 'rich.prompt'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"